@@ -1,16 +1,63 @@
 import os
+import atexit
 import logging
-from flask import Flask
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from flask import Flask, request
 from flask_cors import CORS
+from flask_compress import Compress
 from config import config
-from models import db
-from routes import participants_bp, captcha_bp
-from routes.health_optimized import health_optimized_bp
-from routes.admin_optimized import admin_optimized_bp
-from routes.participants_enhanced import participants_bp as participants_enhanced_bp
-from routes.participants_bot_service import bot_service_bp
-from routes.bot_service_final import bot_service_final_bp
-from routes.participants_bot_integration import participants_bot_bp
+from models import db, register_cache_sync
+from utils.json_provider import OrjsonProvider
+
+_log_listener = None
+
+def _enable_queue_logging():
+    """Hand root log records to a background thread for formatting and I/O.
+
+    Request threads then only enqueue the record instead of contending for
+    the stream handler's lock while it writes. Runs once per process.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+    
+    root = logging.getLogger()
+    handlers = [h for h in root.handlers if not isinstance(h, QueueHandler)]
+    if not handlers:
+        return
+    
+    log_queue = queue.SimpleQueue()
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    
+    _log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_stop_queue_logging)
+
+def _stop_queue_logging():
+    """Flush and stop this process's current log listener"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+def restart_queue_logging():
+    """Start a log listener in a freshly forked process.
+
+    The listener thread does not survive fork(): with gunicorn's
+    preload_app the master starts it, and without this every worker's
+    records would pile up in the queue unwritten. Call once per child.
+    """
+    global _log_listener
+    if _log_listener is None:
+        return
+    
+    _log_listener = QueueListener(
+        _log_listener.queue, *_log_listener.handlers, respect_handler_level=True
+    )
+    _log_listener.start()
 
 def create_app(config_name=None):
     """Application factory pattern"""
@@ -19,39 +66,78 @@ def create_app(config_name=None):
         config_name = os.getenv('FLASK_ENV', 'development')
     
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     
     # Load configuration
     app.config.from_object(config[config_name])
+    config[config_name].init_app(app)
     
     # Setup logging
     logging.basicConfig(
         level=getattr(logging, app.config.get('LOG_LEVEL', 'INFO')),
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
+    # Tests keep synchronous handlers so pytest's log capture sees records
+    if not app.testing:
+        _enable_queue_logging()
     
     # Initialize extensions
     db.init_app(app)
+    # Drop Redis entries once a commit changes the rows behind them
+    register_cache_sync()
     
     # Setup CORS
     CORS(app, origins=app.config.get('CORS_ORIGINS', '*'))
     
-    # Register blueprints
+    # gzip/brotli responses for clients that accept it
+    Compress(app)
+    
+    # Optional Redis read cache for the Bot Service hot paths
+    from utils.redis_cache import redis_cache
+    redis_cache.init_app(app)
+    
+    # Register blueprints (imported here so CLI/worker/test imports of this
+    # module don't pay for every route module up front)
+    from routes import participants_bp, captcha_bp
+    from routes.health_optimized import health_optimized_bp
+    from routes.admin_optimized import admin_optimized_bp
+    from routes.participants_enhanced import participants_bp as participants_enhanced_bp
+    from routes.participants_bot_service import bot_service_bp
+    from routes.bot_service_final import bot_service_final_bp
+    
     app.register_blueprint(participants_bp)
     app.register_blueprint(participants_enhanced_bp)  # Enhanced Bot Service endpoints
     app.register_blueprint(bot_service_bp)  # Working Bot Service endpoints
     app.register_blueprint(bot_service_final_bp)  # Final working Bot Service endpoints (v2)
-    app.register_blueprint(participants_bot_bp)  # EXACT Bot Service integration endpoints
     app.register_blueprint(captcha_bp)
     app.register_blueprint(health_optimized_bp)  # Optimized health endpoints
     app.register_blueprint(admin_optimized_bp)  # Optimized admin endpoints
     
-    # Create database tables
-    with app.app_context():
-        try:
-            db.create_all()
-            app.logger.info("Database tables created successfully")
-        except Exception as e:
-            app.logger.error(f"Error creating database tables: {e}")
+    # Create database tables (skipped in production, see AUTO_CREATE_TABLES)
+    if app.config.get('AUTO_CREATE_TABLES', False):
+        with app.app_context():
+            try:
+                db.create_all()
+                app.config['_DB_INITIALIZED'] = True
+                app.logger.info("Database tables created successfully")
+            except Exception as e:
+                app.logger.error(f"Error creating database tables: {e}")
+    
+    # Guard against N+1 query regressions in tests
+    if app.testing:
+        from flask_sqlalchemy.record_queries import get_recorded_queries
+        
+        @app.after_request
+        def check_query_count(response):
+            queries = get_recorded_queries()
+            max_queries = app.config.get('MAX_QUERIES_PER_REQUEST', 10)
+            if len(queries) > max_queries:
+                for query in queries:
+                    app.logger.error(f"Query ({query.duration:.4f}s): {query.statement}")
+                raise AssertionError(
+                    f"{len(queries)} queries issued for {request.path}, limit is {max_queries}"
+                )
+            return response
     
     # Add error handlers
     @app.errorhandler(404)
@@ -79,37 +165,44 @@ def create_app(config_name=None):
             'error_code': 'INTERNAL_ERROR'
         }, 500
     
+    # Root and info payloads never change, so serialize them once
+    root_body = app.json.dumps({
+        'service': 'telegive-participant',
+        'version': '1.0.0',
+        'status': 'running',
+        'endpoints': {
+            'health': '/health',
+            'participants': '/api/participants/*',
+            'captcha': '/api/participants/validate-captcha'
+        }
+    })
+    
+    info_body = app.json.dumps({
+        'service': app.config.get('SERVICE_NAME', 'participant-service'),
+        'version': '1.0.0',
+        'description': 'Participant Management Service for Telegive',
+        'capabilities': [
+            'User participation tracking',
+            'Math captcha system',
+            'Cryptographic winner selection',
+            'Subscription verification',
+            'Participation history'
+        ],
+        'database': 'PostgreSQL',
+        'framework': 'Flask'
+    })
+    
+    static_headers = {'Cache-Control': 'public, max-age=60'}
+    
     # Add root endpoint
     @app.route('/')
     def root():
-        return {
-            'service': 'telegive-participant',
-            'version': '1.0.0',
-            'status': 'running',
-            'endpoints': {
-                'health': '/health',
-                'participants': '/api/participants/*',
-                'captcha': '/api/participants/validate-captcha'
-            }
-        }
+        return app.response_class(root_body, mimetype='application/json', headers=static_headers)
     
     # Add service info endpoint
     @app.route('/info')
     def service_info():
-        return {
-            'service': app.config.get('SERVICE_NAME', 'participant-service'),
-            'version': '1.0.0',
-            'description': 'Participant Management Service for Telegive',
-            'capabilities': [
-                'User participation tracking',
-                'Math captcha system',
-                'Cryptographic winner selection',
-                'Subscription verification',
-                'Participation history'
-            ],
-            'database': 'PostgreSQL',
-            'framework': 'Flask'
-        }
+        return app.response_class(info_body, mimetype='application/json', headers=static_headers)
     
     app.logger.info(f"Participant service started in {config_name} mode")
     
@@ -124,6 +217,11 @@ if __name__ == '__main__':
     
     app.logger.info(f"Starting Participant Management Service on {host}:{port}")
     
+    # With the debug reloader only the child process serves requests
+    if not app.debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        from tasks.scheduler import start_scheduler
+        start_scheduler(app)
+    
     app.run(
         host=host,
         port=port,
@@ -1,14 +1,39 @@
 import os
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file (once per process tree; forked
+# workers and repeated imports reuse the already-populated environment)
+if not os.environ.get('_ENV_LOADED'):
+    load_dotenv()
+    os.environ['_ENV_LOADED'] = '1'
+
+# Numeric settings, parsed once at import
+SERVICE_PORT = int(os.getenv('SERVICE_PORT', 8004))
+CAPTCHA_TIMEOUT_MINUTES = int(os.getenv('CAPTCHA_TIMEOUT_MINUTES', 10))
+CAPTCHA_MAX_ATTEMPTS = int(os.getenv('CAPTCHA_MAX_ATTEMPTS', 3))
+CAPTCHA_MIN_NUMBER = int(os.getenv('CAPTCHA_MIN_NUMBER', 1))
+CAPTCHA_MAX_NUMBER = int(os.getenv('CAPTCHA_MAX_NUMBER', 10))
+# Captcha answers accepted per user within the sliding window (needs Redis)
+CAPTCHA_RATE_LIMIT = int(os.getenv('CAPTCHA_RATE_LIMIT', 10))
+CAPTCHA_RATE_WINDOW_SECONDS = int(os.getenv('CAPTCHA_RATE_WINDOW_SECONDS', 60))
+
+# Split the database connection budget across gunicorn workers (each gevent
+# worker serves many requests over one pool); DB_POOL_SIZE/DB_MAX_OVERFLOW
+# still override the derived sizes
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', 1))
+DB_CONNECTIONS_PER_WORKER = max(int(os.getenv('DB_MAX_CONNECTIONS', 100)) // WEB_CONCURRENCY, 2)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', DB_CONNECTIONS_PER_WORKER // 2))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', DB_CONNECTIONS_PER_WORKER - DB_POOL_SIZE))
+
+# Development-only fallback; it also signs captcha session tokens, so
+# production refuses to start with it
+DEFAULT_SECRET_KEY = 'dev-secret-key-change-in-production'
 
 class Config:
     """Base configuration class"""
     
     # Flask settings
-    SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
+    SECRET_KEY = os.getenv('SECRET_KEY', DEFAULT_SECRET_KEY)
     DEBUG = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     
     # Database settings
@@ -17,14 +42,28 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ENGINE_OPTIONS = {
         'pool_pre_ping': True,
-        'pool_recycle': 300,
+        # Recycle before the platform NAT drops idle connections, so a
+        # checkout does not pay for a fresh TLS handshake and auth
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 280)),
         'pool_timeout': 20,
-        'max_overflow': 0
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW
     }
+    if DATABASE_URL.startswith('postgresql'):
+        # libpq TCP keepalives keep pooled connections alive between
+        # requests; other drivers reject these connect arguments
+        SQLALCHEMY_ENGINE_OPTIONS['connect_args'] = {
+            'keepalives': 1,
+            'keepalives_idle': int(os.getenv('DB_KEEPALIVES_IDLE', 30)),
+            'keepalives_interval': 10,
+            'keepalives_count': 3
+        }
+    # Connections opened and pinged per worker at startup (gunicorn post_fork)
+    DB_POOL_WARMUP = int(os.getenv('DB_POOL_WARMUP', 2))
     
     # Service configuration
     SERVICE_NAME = os.getenv('SERVICE_NAME', 'participant-service')
-    SERVICE_PORT = int(os.getenv('SERVICE_PORT', 8004))
+    SERVICE_PORT = SERVICE_PORT
     
     # Other services URLs
     TELEGIVE_AUTH_URL = os.getenv('TELEGIVE_AUTH_URL', 'https://telegive-auth.railway.app')
@@ -35,10 +74,12 @@ class Config:
     TELEGRAM_API_BASE = os.getenv('TELEGRAM_API_BASE', 'https://api.telegram.org')
     
     # Captcha configuration
-    CAPTCHA_TIMEOUT_MINUTES = int(os.getenv('CAPTCHA_TIMEOUT_MINUTES', 10))
-    CAPTCHA_MAX_ATTEMPTS = int(os.getenv('CAPTCHA_MAX_ATTEMPTS', 3))
-    CAPTCHA_MIN_NUMBER = int(os.getenv('CAPTCHA_MIN_NUMBER', 1))
-    CAPTCHA_MAX_NUMBER = int(os.getenv('CAPTCHA_MAX_NUMBER', 10))
+    CAPTCHA_TIMEOUT_MINUTES = CAPTCHA_TIMEOUT_MINUTES
+    CAPTCHA_MAX_ATTEMPTS = CAPTCHA_MAX_ATTEMPTS
+    CAPTCHA_MIN_NUMBER = CAPTCHA_MIN_NUMBER
+    CAPTCHA_MAX_NUMBER = CAPTCHA_MAX_NUMBER
+    CAPTCHA_RATE_LIMIT = CAPTCHA_RATE_LIMIT
+    CAPTCHA_RATE_WINDOW_SECONDS = CAPTCHA_RATE_WINDOW_SECONDS
     
     # Winner selection
     SELECTION_METHOD = os.getenv('SELECTION_METHOD', 'cryptographic_random')
@@ -46,6 +87,7 @@ class Config:
     
     # Redis (optional, for caching)
     REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379')
+    REDIS_CACHE_ENABLED = os.getenv('REDIS_CACHE_ENABLED', 'false').lower() == 'true'
     
     # CORS settings
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*')
@@ -56,16 +98,41 @@ class Config:
     
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    
+    # In-process cache for /admin/stats and /admin/db-status (seconds, 0 disables)
+    STATS_CACHE_TTL = int(os.getenv('STATS_CACHE_TTL', 10))
+    DB_STATUS_CACHE_TTL = int(os.getenv('DB_STATUS_CACHE_TTL', 5))
+    
+    # Run db.create_all() in create_app()
+    AUTO_CREATE_TABLES = True
+    
+    # Background cleanup of expired captcha sessions (seconds, 0 disables);
+    # each batch is deleted and committed separately
+    CLEANUP_INTERVAL_SECONDS = int(os.getenv('CLEANUP_INTERVAL_SECONDS', 60))
+    CLEANUP_BATCH_SIZE = int(os.getenv('CLEANUP_BATCH_SIZE', 5000))
+    
+    @staticmethod
+    def init_app(app):
+        """Check the loaded configuration before the app is built"""
 
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
-    SQLALCHEMY_ECHO = True
+    # Statement logging is opt-in; it dominates request latency when on
+    SQLALCHEMY_ECHO = os.getenv('SQL_ECHO', 'false').lower() == 'true'
 
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
     SQLALCHEMY_ECHO = False
+    # Schema is managed via /admin/init-db and /admin/update-schema
+    AUTO_CREATE_TABLES = os.getenv('AUTO_CREATE_TABLES', 'false').lower() == 'true'
+    
+    @staticmethod
+    def init_app(app):
+        """Refuse to start with the development SECRET_KEY"""
+        if app.config['SECRET_KEY'] == DEFAULT_SECRET_KEY:
+            raise RuntimeError('SECRET_KEY must be set in production')
 
 class TestingConfig(Config):
     """Testing configuration"""
@@ -75,6 +142,14 @@ class TestingConfig(Config):
         'pool_pre_ping': True
     }
     WTF_CSRF_ENABLED = False
+    REDIS_CACHE_ENABLED = False
+    STATS_CACHE_TTL = 0
+    DB_STATUS_CACHE_TTL = 0
+    CLEANUP_INTERVAL_SECONDS = 0
+    
+    # Fail any test request that issues more queries than this (N+1 guard)
+    SQLALCHEMY_RECORD_QUERIES = True
+    MAX_QUERIES_PER_REQUEST = int(os.getenv('MAX_QUERIES_PER_REQUEST', 10))
 
 # Configuration mapping
 config = {
@@ -0,0 +1,46 @@
+# Gunicorn configuration for production deployments
+# Usage: gunicorn -c gunicorn_conf.py app:app
+
+# Patch the standard library before the app (and requests/SQLAlchemy) is
+# preloaded so socket I/O yields to other greenlets
+from gevent import monkey
+monkey.patch_all()
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', os.getenv('SERVICE_PORT', 8004))}"
+
+# Async workers: requests waiting on Postgres or the other services
+# (auth/channel/giveaway, Telegram) no longer block a whole worker
+worker_class = 'gevent'
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_connections = int(os.getenv('WORKER_CONNECTIONS', 1000))
+# config.settings divides DB_MAX_CONNECTIONS across this many workers
+os.environ.setdefault('WEB_CONCURRENCY', str(workers))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+
+# Import the app (and all blueprints) once in the master before forking
+preload_app = True
+
+def post_fork(server, worker):
+    """Make psycopg2 cooperative, drop inherited connections and warm the pool"""
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
+    
+    # The master's log listener thread was not copied into this worker
+    from app import app, restart_queue_logging
+    restart_queue_logging()
+    
+    from models import db, warm_pool
+    with app.app_context():
+        db.engine.dispose(close=False)
+        try:
+            warm_pool(db.engine, app.config.get('DB_POOL_WARMUP', 0))
+        except Exception as e:
+            server.log.warning(f"Pool warm-up failed: {e}")
+    
+    # Periodic cleanup runs in every worker; the job itself makes sure only
+    # one deletes at a time
+    from tasks.scheduler import start_scheduler
+    start_scheduler(app)
@@ -1,10 +1,30 @@
-from flask import request, jsonify, current_app
-from functools import wraps
+from flask import request, Response
+from functools import lru_cache, wraps
+import hmac
 import os
 import logging
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1)
+def _expected_service_token():
+    """SERVICE_TO_SERVICE_SECRET as bytes, read on first use (after config
+    has loaded .env) and then cached for the life of the process"""
+    token = os.getenv('SERVICE_TO_SERVICE_SECRET')
+    return token.encode() if token else None
+
+# Pre-serialized rejection bodies so rejected requests skip dict building
+# and JSON encoding
+_AUTH_NOT_CONFIGURED = b'{"success":false,"error":"Service authentication not configured","error_code":"AUTH_NOT_CONFIGURED"}'
+_AUTH_REQUIRED = b'{"success":false,"error":"Service authentication required","error_code":"AUTH_REQUIRED"}'
+_AUTH_INVALID = b'{"success":false,"error":"Invalid service token","error_code":"AUTH_INVALID"}'
+_INVALID_USER_AGENT = b'{"success":false,"error":"Invalid User-Agent for Bot Service","error_code":"INVALID_USER_AGENT"}'
+_INVALID_CONTENT_TYPE = b'{"success":false,"error":"Content-Type must be application/json","error_code":"INVALID_CONTENT_TYPE"}'
+
+def _json_error(body, status=200):
+    """Wrap a pre-serialized JSON error body in a fresh Response"""
+    return Response(body, status=status, mimetype='application/json')
+
 def require_service_token(f):
     """
     Decorator to require service-to-service authentication token
@@ -12,35 +32,21 @@ def require_service_token(f):
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        # Get the expected service token
-        expected_token = os.getenv('SERVICE_TO_SERVICE_SECRET')
-        
+        expected_token = _expected_service_token()
         if not expected_token:
             logger.error("SERVICE_TO_SERVICE_SECRET not configured")
-            return jsonify({
-                'success': False,
-                'error': 'Service authentication not configured',
-                'error_code': 'AUTH_NOT_CONFIGURED'
-            }), 500
+            return _json_error(_AUTH_NOT_CONFIGURED, 500)
         
         # Check for token in headers
         auth_header = request.headers.get('X-Service-Token')
         if not auth_header:
             logger.warning(f"Missing service token for {request.endpoint}")
-            return jsonify({
-                'success': False,
-                'error': 'Service authentication required',
-                'error_code': 'AUTH_REQUIRED'
-            }), 401
+            return _json_error(_AUTH_REQUIRED, 401)
         
-        # Validate token
-        if auth_header != expected_token:
+        # Validate token (constant-time comparison)
+        if not hmac.compare_digest(auth_header.encode(), expected_token):
             logger.warning(f"Invalid service token for {request.endpoint}")
-            return jsonify({
-                'success': False,
-                'error': 'Invalid service token',
-                'error_code': 'AUTH_INVALID'
-            }), 401
+            return _json_error(_AUTH_INVALID, 401)
         
         # Log successful authentication
         service_name = request.headers.get('X-Service-Name', 'unknown')
@@ -81,21 +87,13 @@ def validate_bot_service_request():
     # Check User-Agent
     user_agent = request.headers.get('User-Agent', '')
     if 'TelegiveBotService' not in user_agent:
-        return False, jsonify({
-            'success': False,
-            'error': 'Invalid User-Agent for Bot Service',
-            'error_code': 'INVALID_USER_AGENT'
-        })
+        return False, _json_error(_INVALID_USER_AGENT)
     
     # Check Content-Type for POST/PUT requests
     if request.method in ['POST', 'PUT']:
         content_type = request.headers.get('Content-Type', '')
         if 'application/json' not in content_type:
-            return False, jsonify({
-                'success': False,
-                'error': 'Content-Type must be application/json',
-                'error_code': 'INVALID_CONTENT_TYPE'
-            })
+            return False, _json_error(_INVALID_CONTENT_TYPE)
     
     return True, None
 
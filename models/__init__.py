@@ -1,13 +1,19 @@
-from .participant import Participant, db
+from ._db import db, warm_pool, dialect_insert
+from .participant import Participant
 from .user_captcha_record import UserCaptchaRecord
 from .captcha_session import CaptchaSession
 from .winner_selection_log import WinnerSelectionLog
+from .cache_sync import register_cache_sync, pending_cache_updates
 
 __all__ = [
     'db',
+    'warm_pool',
+    'dialect_insert',
     'Participant',
     'UserCaptchaRecord', 
     'CaptchaSession',
-    'WinnerSelectionLog'
+    'WinnerSelectionLog',
+    'register_cache_sync',
+    'pending_cache_updates'
 ]
 
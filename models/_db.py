@@ -0,0 +1,30 @@
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects import postgresql, sqlite
+from datetime import datetime, timezone
+
+# Shared SQLAlchemy instance used by every model
+db = SQLAlchemy()
+
+# BIGINT primary keys; SQLite (tests) only autoincrements INTEGER PRIMARY KEY
+_BIGINT_PK = db.BigInteger().with_variant(db.Integer(), 'sqlite')
+
+def warm_pool(engine, size):
+    """Open up to size pooled connections and validate each with SELECT 1"""
+    connections = []
+    try:
+        for _ in range(size):
+            connection = engine.connect()
+            connection.exec_driver_sql('SELECT 1')
+            connections.append(connection)
+    finally:
+        for connection in connections:
+            connection.close()
+
+def dialect_insert(model):
+    """INSERT supporting ON CONFLICT clauses on the bound dialect (PostgreSQL, or SQLite in tests)"""
+    insert = postgresql.insert if db.engine.dialect.name == 'postgresql' else sqlite.insert
+    return insert(model)
+
+def _utcnow():
+    """Timezone-aware current UTC time, used as the column default"""
+    return datetime.now(timezone.utc)
@@ -0,0 +1,55 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from utils.redis_cache import redis_cache
+from .participant import Participant
+from .user_captcha_record import UserCaptchaRecord
+
+# Redis entries derived from these rows are dropped (counts bumped) once a
+# commit changes the rows behind them, whichever endpoint made the change.
+# ORM flushes are collected automatically; Core statements (upserts, bulk
+# updates) queue their keys through pending_cache_updates() themselves.
+
+def pending_cache_updates(session):
+    """Redis work queued on session until it commits"""
+    return session.info.setdefault('redis_cache_pending', {'delete': set(), 'incr': []})
+
+def _collect_cache_updates(session, flush_context):
+    pending = pending_cache_updates(session)
+    for obj in session.new:
+        if isinstance(obj, Participant):
+            pending['incr'].append(Participant.count_cache_key(obj.giveaway_id))
+        elif isinstance(obj, UserCaptchaRecord):
+            pending['delete'].add(UserCaptchaRecord.status_cache_key(obj.user_id))
+    for obj in session.dirty:
+        if isinstance(obj, Participant):
+            pending['delete'].add(Participant.winner_count_cache_key(obj.giveaway_id))
+        elif isinstance(obj, UserCaptchaRecord):
+            pending['delete'].add(UserCaptchaRecord.status_cache_key(obj.user_id))
+    for obj in session.deleted:
+        if isinstance(obj, Participant):
+            pending['delete'].add(Participant.count_cache_key(obj.giveaway_id))
+            pending['delete'].add(Participant.winner_count_cache_key(obj.giveaway_id))
+        elif isinstance(obj, UserCaptchaRecord):
+            pending['delete'].add(UserCaptchaRecord.status_cache_key(obj.user_id))
+
+def _apply_cache_updates(session):
+    pending = session.info.pop('redis_cache_pending', None)
+    if pending:
+        redis_cache.delete(*pending['delete'])
+        for key in pending['incr']:
+            redis_cache.incr_if_exists(key)
+
+def _discard_cache_updates(session):
+    session.info.pop('redis_cache_pending', None)
+
+_HOOKS = (
+    ('after_flush', _collect_cache_updates),
+    ('after_commit', _apply_cache_updates),
+    ('after_rollback', _discard_cache_updates),
+)
+
+def register_cache_sync():
+    """Attach the Redis invalidation hooks to every ORM session (idempotent)"""
+    for name, hook in _HOOKS:
+        if not event.contains(Session, name, hook):
+            event.listen(Session, name, hook)
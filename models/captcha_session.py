@@ -1,12 +1,10 @@
-from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime, timedelta
-
-db = SQLAlchemy()
+from ._db import db, _utcnow, _BIGINT_PK
+from datetime import timedelta, timezone
 
 class CaptchaSession(db.Model):
     __tablename__ = 'captcha_sessions'
     
-    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    id = db.Column(_BIGINT_PK, primary_key=True, autoincrement=True)
     user_id = db.Column(db.BigInteger, nullable=False)
     giveaway_id = db.Column(db.BigInteger, nullable=False)
     question = db.Column(db.Text, nullable=False)
@@ -15,18 +13,20 @@ class CaptchaSession(db.Model):
     max_attempts = db.Column(db.Integer, default=3)
     completed = db.Column(db.Boolean, default=False)
     expires_at = db.Column(db.DateTime(timezone=True), nullable=False)
-    created_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow)
+    created_at = db.Column(db.DateTime(timezone=True), default=_utcnow)
     
     # Indexes for efficient queries
     __table_args__ = (
-        db.Index('idx_captcha_sessions_user_giveaway', 'user_id', 'giveaway_id'),
+        # Active-session lookup: filter on all three, newest first
+        db.Index('idx_captcha_sessions_lookup', 'user_id', 'giveaway_id', 'completed', db.text('created_at DESC')),
         db.Index('idx_captcha_sessions_expires_at', 'expires_at'),
+        db.Index('idx_captcha_active', 'expires_at', postgresql_where=db.text('NOT completed')),
     )
     
     @classmethod
     def create_session(cls, user_id, giveaway_id, question, correct_answer, timeout_minutes=10):
         """Create a new captcha session with expiration"""
-        expires_at = datetime.utcnow() + timedelta(minutes=timeout_minutes)
+        expires_at = _utcnow() + timedelta(minutes=timeout_minutes)
         return cls(
             user_id=user_id,
             giveaway_id=giveaway_id,
@@ -35,13 +35,17 @@ class CaptchaSession(db.Model):
             expires_at=expires_at
         )
     
-    def is_expired(self):
+    def is_expired(self, now=None):
         """Check if the captcha session has expired"""
-        return datetime.utcnow() > self.expires_at
+        expires_at = self.expires_at
+        if expires_at.tzinfo is None:
+            # Backends without timezone support (SQLite) hand back naive UTC
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return (now or _utcnow()) > expires_at
     
-    def can_attempt(self):
+    def can_attempt(self, now=None):
         """Check if user can still attempt to answer"""
-        return not self.completed and self.attempts < self.max_attempts and not self.is_expired()
+        return not self.completed and self.attempts < self.max_attempts and not self.is_expired(now)
     
     def increment_attempts(self):
         """Increment the number of attempts"""
@@ -53,6 +57,7 @@ class CaptchaSession(db.Model):
     
     def to_dict(self):
         """Convert captcha session to dictionary for API responses"""
+        now = _utcnow()
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -61,10 +66,10 @@ class CaptchaSession(db.Model):
             'attempts': self.attempts,
             'max_attempts': self.max_attempts,
             'completed': self.completed,
-            'expires_at': self.expires_at.isoformat() if self.expires_at else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'is_expired': self.is_expired(),
-            'can_attempt': self.can_attempt(),
+            'expires_at': self.expires_at,
+            'created_at': self.created_at,
+            'is_expired': self.is_expired(now),
+            'can_attempt': self.can_attempt(now),
             'attempts_remaining': max(0, self.max_attempts - self.attempts)
         }
     
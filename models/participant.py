@@ -1,12 +1,21 @@
-from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from operator import attrgetter
+from flask import current_app
+from sqlalchemy import select, text
+from ._db import db, _utcnow, _BIGINT_PK
 
-db = SQLAlchemy()
+# to_dict() keys, which match the column attribute names
+_PARTICIPANT_FIELDS = (
+    'id', 'giveaway_id', 'user_id', 'username', 'first_name', 'last_name',
+    'participated_at', 'captcha_completed', 'subscription_verified',
+    'subscription_verified_at', 'is_winner', 'winner_selected_at',
+    'message_delivered', 'delivery_timestamp', 'delivery_attempts'
+)
+_get_fields = attrgetter(*_PARTICIPANT_FIELDS)
 
 class Participant(db.Model):
     __tablename__ = 'participants'
     
-    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    id = db.Column(_BIGINT_PK, primary_key=True, autoincrement=True)
     giveaway_id = db.Column(db.BigInteger, nullable=False)
     user_id = db.Column(db.BigInteger, nullable=False)
     username = db.Column(db.String(100), default=None)
@@ -14,7 +23,7 @@ class Participant(db.Model):
     last_name = db.Column(db.String(100), default=None)
     
     # Participation details
-    participated_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow)
+    participated_at = db.Column(db.DateTime(timezone=True), default=_utcnow)
     captcha_completed = db.Column(db.Boolean, default=False)
     subscription_verified = db.Column(db.Boolean, default=False)
     subscription_verified_at = db.Column(db.DateTime(timezone=True), default=None)
@@ -34,27 +43,74 @@ class Participant(db.Model):
         db.Index('idx_participants_giveaway_id', 'giveaway_id'),
         db.Index('idx_participants_user_id', 'user_id'),
         db.Index('idx_participants_is_winner', 'is_winner'),
+        db.Index('idx_participants_participated_at', 'participated_at'),
+        db.Index('idx_participants_winners', 'giveaway_id', postgresql_where=db.text('is_winner')),
+        # Covers the winner-draw eligibility query with an index-only scan
+        db.Index('idx_participants_eligible', 'giveaway_id', 'id', 'user_id',
+                 postgresql_where=db.text('captcha_completed AND subscription_verified')),
     )
     
+    @staticmethod
+    def count_cache_key(giveaway_id):
+        """Redis key of a giveaway's cached participant count"""
+        return f'giveaway:count:{giveaway_id}'
+    
+    @staticmethod
+    def winner_count_cache_key(giveaway_id):
+        """Redis key of a giveaway's cached winner count"""
+        return f'giveaway:winners:{giveaway_id}'
+    
+    @classmethod
+    def page_as_json(cls, giveaway_id, limit, offset=0):
+        """Serialize one page of a giveaway's participants to a JSON array string"""
+        if db.engine.dialect.name == 'postgresql':
+            # Let PostgreSQL build the JSON; skips ORM hydration and to_dict()
+            result = db.session.execute(text("""
+                SELECT json_agg(row_to_json(p) ORDER BY p.id)::text
+                FROM (
+                    SELECT * FROM participants
+                    WHERE giveaway_id = :giveaway_id
+                    ORDER BY id
+                    LIMIT :limit OFFSET :offset
+                ) p
+            """), {'giveaway_id': giveaway_id, 'limit': limit, 'offset': offset}).scalar()
+            return result or '[]'
+        
+        rows = db.session.execute(
+            select(*cls.__table__.columns)
+            .where(cls.giveaway_id == giveaway_id)
+            .order_by(cls.id).offset(offset).limit(limit)
+        ).mappings().all()
+        return current_app.json.dumps([dict(row) for row in rows])
+    
+    @classmethod
+    def page_after_as_json(cls, giveaway_id, limit, after_id=0):
+        """Keyset page: up to limit participants with id > after_id, as
+        (JSON array string, last id on the page or None)"""
+        if db.engine.dialect.name == 'postgresql':
+            # Index range scan on (giveaway_id, id); no rows are skipped over
+            result = db.session.execute(text("""
+                SELECT coalesce(json_agg(row_to_json(p) ORDER BY p.id)::text, '[]'), max(p.id)
+                FROM (
+                    SELECT * FROM participants
+                    WHERE giveaway_id = :giveaway_id AND id > :after_id
+                    ORDER BY id
+                    LIMIT :limit
+                ) p
+            """), {'giveaway_id': giveaway_id, 'after_id': after_id, 'limit': limit}).one()
+            return result[0], result[1]
+        
+        rows = db.session.execute(
+            select(*cls.__table__.columns)
+            .where(cls.giveaway_id == giveaway_id, cls.id > after_id)
+            .order_by(cls.id).limit(limit)
+        ).mappings().all()
+        last_id = rows[-1]['id'] if rows else None
+        return current_app.json.dumps([dict(row) for row in rows]), last_id
+    
     def to_dict(self):
         """Convert participant to dictionary for API responses"""
-        return {
-            'id': self.id,
-            'giveaway_id': self.giveaway_id,
-            'user_id': self.user_id,
-            'username': self.username,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'participated_at': self.participated_at.isoformat() if self.participated_at else None,
-            'captcha_completed': self.captcha_completed,
-            'subscription_verified': self.subscription_verified,
-            'subscription_verified_at': self.subscription_verified_at.isoformat() if self.subscription_verified_at else None,
-            'is_winner': self.is_winner,
-            'winner_selected_at': self.winner_selected_at.isoformat() if self.winner_selected_at else None,
-            'message_delivered': self.message_delivered,
-            'delivery_timestamp': self.delivery_timestamp.isoformat() if self.delivery_timestamp else None,
-            'delivery_attempts': self.delivery_attempts
-        }
+        return dict(zip(_PARTICIPANT_FIELDS, _get_fields(self)))
     
     def __repr__(self):
         return f'<Participant {self.id}: User {self.user_id} in Giveaway {self.giveaway_id}>'
@@ -1,38 +1,84 @@
-from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from operator import attrgetter
+from sqlalchemy import bindparam, select
+from utils.redis_cache import redis_cache
+from ._db import db, _utcnow, _BIGINT_PK
 
-db = SQLAlchemy()
+# to_dict() keys, which match the column attribute names
+_USER_CAPTCHA_RECORD_FIELDS = (
+    'id', 'user_id', 'captcha_completed', 'captcha_completed_at',
+    'first_participation_at', 'total_participations', 'total_wins',
+    'last_participation_at'
+)
+_get_fields = attrgetter(*_USER_CAPTCHA_RECORD_FIELDS)
+
+# Cached status entries are dropped by the session hooks in
+# models/cache_sync.py whenever a record is written. A read that started
+# before such a commit can still write its older row back after the drop,
+# so the TTL is kept short: it bounds how long that stale entry survives
+STATUS_CACHE_TTL = 60
 
 class UserCaptchaRecord(db.Model):
     __tablename__ = 'user_captcha_records'
     
-    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    id = db.Column(_BIGINT_PK, primary_key=True, autoincrement=True)
     user_id = db.Column(db.BigInteger, nullable=False, unique=True)
     captcha_completed = db.Column(db.Boolean, default=False)
     captcha_completed_at = db.Column(db.DateTime(timezone=True), default=None)
-    first_participation_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow)
+    first_participation_at = db.Column(db.DateTime(timezone=True), default=_utcnow)
     total_participations = db.Column(db.Integer, default=0)
     total_wins = db.Column(db.Integer, default=0)
-    last_participation_at = db.Column(db.DateTime(timezone=True), default=datetime.utcnow)
+    last_participation_at = db.Column(db.DateTime(timezone=True), default=_utcnow)
     
     # Index for fast user lookups
     __table_args__ = (
         db.Index('idx_user_captcha_records_user_id', 'user_id'),
+        db.Index('idx_ucr_completed_at', 'captcha_completed_at', postgresql_where=db.text('captcha_completed')),
     )
     
+    @staticmethod
+    def status_cache_key(user_id):
+        """Redis key of a user's cached captcha status"""
+        return f'user:captcha:{user_id}'
+    
+    @classmethod
+    def cached_status(cls, user_id):
+        """A user's global captcha status, read through the Redis cache.
+
+        Unknown users get captcha_completed False and no completed_at.
+        """
+        cache_key = cls.status_cache_key(user_id)
+        status = redis_cache.get_json(cache_key)
+        if status is not None:
+            return status
+        
+        row = db.session.execute(_STATUS_BY_USER, {'user_id': user_id}).mappings().first()
+        if row:
+            status = dict(row)
+        else:
+            status = {
+                'captcha_completed': False,
+                'total_participations': 0,
+                'total_wins': 0
+            }
+        
+        redis_cache.set_json(cache_key, status, STATUS_CACHE_TTL)
+        return status
+    
     def to_dict(self):
         """Convert user captcha record to dictionary for API responses"""
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'captcha_completed': self.captcha_completed,
-            'captcha_completed_at': self.captcha_completed_at.isoformat() if self.captcha_completed_at else None,
-            'first_participation_at': self.first_participation_at.isoformat() if self.first_participation_at else None,
-            'total_participations': self.total_participations,
-            'total_wins': self.total_wins,
-            'last_participation_at': self.last_participation_at.isoformat() if self.last_participation_at else None
-        }
+        return dict(zip(_USER_CAPTCHA_RECORD_FIELDS, _get_fields(self)))
     
     def __repr__(self):
         return f'<UserCaptchaRecord {self.id}: User {self.user_id}, Captcha: {self.captcha_completed}>'
 
+# user_id is unique but not the primary key, so Session.get() does not
+# apply; build the lookup once and reuse its cached compilation. Only the
+# status columns are selected, as plain rows with no ORM instance
+_STATUS_BY_USER = select(
+    UserCaptchaRecord.captcha_completed,
+    UserCaptchaRecord.captcha_completed_at.label('completed_at'),
+    UserCaptchaRecord.total_participations,
+    UserCaptchaRecord.total_wins,
+    UserCaptchaRecord.first_participation_at.label('first_participation')
+).where(UserCaptchaRecord.user_id == bindparam('user_id'))
+
@@ -1,12 +1,25 @@
-from .participants import participants_bp
-from .captcha import captcha_bp
-from .health import health_bp
-from .admin import admin_bp
+import importlib
+
+# Blueprints are resolved lazily (PEP 562) so importing the package does not
+# pull in every route module and its dependencies.
+_BLUEPRINT_MODULES = {
+    'participants_bp': 'participants',
+    'captcha_bp': 'captcha'
+}
 
 __all__ = [
     'participants_bp',
-    'captcha_bp',
-    'health_bp',
-    'admin_bp'
+    'captcha_bp'
 ]
 
+def __getattr__(name):
+    if name not in _BLUEPRINT_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    module = importlib.import_module(f".{_BLUEPRINT_MODULES[name]}", __name__)
+    blueprint = getattr(module, name)
+    globals()[name] = blueprint
+    return blueprint
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
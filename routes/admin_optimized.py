@@ -1,98 +1,293 @@
-from flask import Blueprint, jsonify, request, current_app
+from flask import Blueprint, jsonify, current_app
 from models import db
 from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from utils.captcha_generator import captcha_generator
+from utils.winner_selection import select_winners_cryptographic
+from utils.http_cache import encode_json, conditional_response
+from services.health_probe import probe_external_services
+from tasks.cleanup_tasks import cleanup_tasks
 import logging
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
 admin_optimized_bp = Blueprint('admin_optimized', __name__)
 
+# Shared fields of every admin error body
+_ERROR_TEMPLATE = {'success': False, 'service': 'participant-service'}
+
+def _err(code, message, status=500):
+    """Error response built from the shared template"""
+    payload = dict(_ERROR_TEMPLATE, error=message, error_code=code)
+    return current_app.response_class(current_app.json.dumps(payload), status=status, mimetype='application/json')
+
+# key -> (computed_at, body, etag); only successful results are kept
+_cache = {}
+_cache_lock = threading.Lock()
+_refreshing = set()
+
+STALE_WHILE_REVALIDATE = 30
+
+def _refresh(app, key, compute):
+    """Recompute a cache entry in the background"""
+    try:
+        with app.app_context():
+            payload, status = compute()
+            body, etag = encode_json(payload)
+        if status == 200:
+            with _cache_lock:
+                _cache[key] = (time.monotonic(), body, etag)
+    except Exception:
+        logger.exception("Background refresh of %s failed", key)
+    finally:
+        with _cache_lock:
+            _refreshing.discard(key)
+
+def _cached_response(key, ttl, compute):
+    """Serve compute() memoized for ttl seconds, refreshing stale entries in the background"""
+    if ttl <= 0:
+        payload, status = compute()
+        return conditional_response(*encode_json(payload), status)
+    
+    headers = {'Cache-Control': f'public, max-age={ttl}, stale-while-revalidate={STALE_WHILE_REVALIDATE}'}
+    now = time.monotonic()
+    
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            age = now - entry[0]
+            if age < ttl:
+                return conditional_response(entry[1], entry[2], headers=headers)
+            if age < ttl + STALE_WHILE_REVALIDATE:
+                if key not in _refreshing:
+                    _refreshing.add(key)
+                    threading.Thread(
+                        target=_refresh,
+                        args=(current_app._get_current_object(), key, compute),
+                        daemon=True
+                    ).start()
+                return conditional_response(entry[1], entry[2], headers=headers)
+    
+    payload, status = compute()
+    body, etag = encode_json(payload)
+    if status != 200:
+        # Errors are neither cached here nor marked cacheable downstream
+        return conditional_response(body, etag, status)
+    
+    with _cache_lock:
+        _cache[key] = (time.monotonic(), body, etag)
+    return conditional_response(body, etag, status, headers)
+
+_COUNTERS_EXIST = text("SELECT to_regclass('participant_counters') IS NOT NULL")
+
+# Whether participant_counters exists. Re-checked every COUNTERS_RECHECK
+# seconds so workers that did not run /admin/update-schema pick the table up
+# (and a dropped table is noticed) without a per-request catalog query.
+COUNTERS_RECHECK = 60
+_counters_available = None
+_counters_checked_at = 0.0
+
+# Participant total (exact counter row, or planner estimate) plus the
+# number joined since :since, in one statement
+_COUNTS_SQL = """
+    SELECT
+        {total} AS total,
+        (SELECT reltuples::bigint FROM pg_class WHERE relname = 'participants') AS estimate,
+        (SELECT count(*) FROM participants WHERE participated_at > :since) AS recent
+"""
+_COUNTS_FROM_COUNTER = text(_COUNTS_SQL.format(total="(SELECT total FROM participant_counters WHERE id = 1)"))
+_COUNTS_ESTIMATED = text(_COUNTS_SQL.format(total="NULL::bigint"))
+
+def participant_counts(since):
+    """Participant (total, estimated, joined_since) in a single round-trip.
+
+    The total comes from the trigger-maintained participant_counters row,
+    or from the pg_class estimate until /admin/update-schema has created it.
+    """
+    global _counters_available, _counters_checked_at
+    now = time.monotonic()
+    if _counters_available is None or now - _counters_checked_at >= COUNTERS_RECHECK:
+        _counters_available = db.session.execute(_COUNTERS_EXIST).scalar()
+        _counters_checked_at = now
+    
+    row = None
+    if _counters_available:
+        try:
+            row = db.session.execute(_COUNTS_FROM_COUNTER, {'since': since}).one()
+        except ProgrammingError:
+            # Dropped since the last check: use the estimate and re-check next call
+            db.session.rollback()
+            _counters_available = None
+    if row is None:
+        row = db.session.execute(_COUNTS_ESTIMATED, {'since': since}).one()
+    
+    if row.total is not None:
+        return row.total, False, row.recent
+    return max(row.estimate or 0, 0), True, row.recent
+
+# Schema updates for Bot Service integration, joined once into a single
+# multi-statement batch at import
+_SCHEMA_UPDATES = (
+    # Create user_captcha_records table
+    """CREATE TABLE IF NOT EXISTS user_captcha_records (
+        id SERIAL PRIMARY KEY,
+        user_id BIGINT NOT NULL UNIQUE,
+        captcha_completed BOOLEAN DEFAULT FALSE,
+        captcha_completed_at TIMESTAMPTZ,
+        first_participation_at TIMESTAMPTZ,
+        total_participations INTEGER DEFAULT 0,
+        total_wins INTEGER DEFAULT 0,
+        created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+    )""",
+    
+    # Create captcha_sessions table
+    """CREATE TABLE IF NOT EXISTS captcha_sessions (
+        id SERIAL PRIMARY KEY,
+        user_id BIGINT NOT NULL,
+        giveaway_id INTEGER NOT NULL,
+        session_id VARCHAR(32) NOT NULL UNIQUE,
+        question TEXT NOT NULL,
+        correct_answer INTEGER NOT NULL,
+        attempts INTEGER DEFAULT 0,
+        max_attempts INTEGER DEFAULT 3,
+        expires_at TIMESTAMPTZ NOT NULL,
+        created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+    )""",
+    
+    # Create winner_selection_logs table
+    """CREATE TABLE IF NOT EXISTS winner_selection_logs (
+        id SERIAL PRIMARY KEY,
+        giveaway_id INTEGER NOT NULL,
+        total_participants INTEGER NOT NULL,
+        winner_count_requested INTEGER NOT NULL,
+        winner_count_selected INTEGER NOT NULL,
+        selection_method VARCHAR(50) NOT NULL,
+        winner_user_ids BIGINT[] NOT NULL,
+        selection_timestamp TIMESTAMPTZ NOT NULL,
+        created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+    )""",
+    
+    # Add indexes for performance
+    """CREATE INDEX IF NOT EXISTS idx_user_captcha_records_user_id ON user_captcha_records(user_id)""",
+    """CREATE INDEX IF NOT EXISTS idx_captcha_sessions_user_id ON captcha_sessions(user_id)""",
+    """CREATE INDEX IF NOT EXISTS idx_captcha_sessions_session_id ON captcha_sessions(session_id)""",
+    """CREATE INDEX IF NOT EXISTS idx_captcha_sessions_expires_at ON captcha_sessions(expires_at)""",
+    """CREATE INDEX IF NOT EXISTS idx_winner_selection_logs_giveaway_id ON winner_selection_logs(giveaway_id)""",
+    
+    # Older captcha_sessions tables predate the completed flag
+    """ALTER TABLE captcha_sessions ADD COLUMN IF NOT EXISTS completed BOOLEAN DEFAULT FALSE""",
+    
+    # The models write timezone-aware UTC datetimes; convert columns left
+    # naive by older schemas, reading their stored values as UTC
+    """DO $$
+    DECLARE col record;
+    BEGIN
+        FOR col IN
+            SELECT table_name, column_name FROM information_schema.columns
+            WHERE table_schema = current_schema()
+              AND table_name IN ('participants', 'user_captcha_records', 'captcha_sessions', 'winner_selection_log', 'winner_selection_logs')
+              AND data_type = 'timestamp without time zone'
+        LOOP
+            EXECUTE format('ALTER TABLE %I ALTER COLUMN %I TYPE TIMESTAMPTZ USING %I AT TIME ZONE ''UTC''',
+                           col.table_name, col.column_name, col.column_name);
+        END LOOP;
+    END
+    $$""",
+    
+    # Partial indexes for the stats/count queries
+    """CREATE INDEX IF NOT EXISTS idx_captcha_active ON captcha_sessions(expires_at) WHERE NOT completed""",
+    """CREATE INDEX IF NOT EXISTS idx_ucr_completed_at ON user_captcha_records(captcha_completed_at) WHERE captcha_completed""",
+    """CREATE INDEX IF NOT EXISTS idx_participants_participated_at ON participants(participated_at)""",
+    """CREATE INDEX IF NOT EXISTS idx_participants_winners ON participants(giveaway_id) WHERE is_winner""",
+    """CREATE INDEX IF NOT EXISTS idx_participants_eligible ON participants(giveaway_id, id, user_id) WHERE captcha_completed AND subscription_verified""",
+    
+    # Active captcha session lookup; its (user_id, giveaway_id) prefix
+    # replaces the narrower index
+    """CREATE INDEX IF NOT EXISTS idx_captcha_sessions_lookup ON captcha_sessions(user_id, giveaway_id, completed, created_at DESC)""",
+    """DROP INDEX IF EXISTS idx_captcha_sessions_user_giveaway""",
+    
+    # Trigger-maintained participant total, read by the stats endpoints
+    # instead of COUNT(*). The trigger is created before the seed so
+    # no insert committed in between is missed. Trade-off: every insert
+    # or delete updates this one row, so concurrent joins serialize on its
+    # row lock until they commit. That is cheap at this service's write
+    # rate; under heavy contention, spread it over N slot rows (random
+    # slot per write) and read SUM(total) instead.
+    """CREATE TABLE IF NOT EXISTS participant_counters (
+        id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+        total BIGINT NOT NULL DEFAULT 0,
+        updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE OR REPLACE FUNCTION bump_participant_counters() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE participant_counters SET total = total + 1, updated_at = now() WHERE id = 1;
+        ELSE
+            UPDATE participant_counters SET total = total - 1, updated_at = now() WHERE id = 1;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    """DROP TRIGGER IF EXISTS participants_counter ON participants""",
+    """CREATE TRIGGER participants_counter AFTER INSERT OR DELETE ON participants
+        FOR EACH ROW EXECUTE FUNCTION bump_participant_counters()""",
+    """INSERT INTO participant_counters (id, total)
+        SELECT 1, count(*) FROM participants
+        ON CONFLICT (id) DO NOTHING"""
+)
+_SCHEMA_BATCH = ';\n'.join(_SCHEMA_UPDATES)
+
 @admin_optimized_bp.route('/admin/update-schema', methods=['POST'])
 def update_database_schema():
     """Update database schema for Bot Service integration"""
     try:
-        # Schema updates for Bot Service integration
-        schema_updates = [
-            # Create user_captcha_records table
-            """CREATE TABLE IF NOT EXISTS user_captcha_records (
-                id SERIAL PRIMARY KEY,
-                user_id BIGINT NOT NULL UNIQUE,
-                captcha_completed BOOLEAN DEFAULT FALSE,
-                captcha_completed_at TIMESTAMP,
-                first_participation_at TIMESTAMP,
-                total_participations INTEGER DEFAULT 0,
-                total_wins INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )""",
-            
-            # Create captcha_sessions table
-            """CREATE TABLE IF NOT EXISTS captcha_sessions (
-                id SERIAL PRIMARY KEY,
-                user_id BIGINT NOT NULL,
-                giveaway_id INTEGER NOT NULL,
-                session_id VARCHAR(32) NOT NULL UNIQUE,
-                question TEXT NOT NULL,
-                correct_answer INTEGER NOT NULL,
-                attempts INTEGER DEFAULT 0,
-                max_attempts INTEGER DEFAULT 3,
-                expires_at TIMESTAMP NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )""",
-            
-            # Create winner_selection_logs table
-            """CREATE TABLE IF NOT EXISTS winner_selection_logs (
-                id SERIAL PRIMARY KEY,
-                giveaway_id INTEGER NOT NULL,
-                total_participants INTEGER NOT NULL,
-                winner_count_requested INTEGER NOT NULL,
-                winner_count_selected INTEGER NOT NULL,
-                selection_method VARCHAR(50) NOT NULL,
-                winner_user_ids BIGINT[] NOT NULL,
-                selection_timestamp TIMESTAMP NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )""",
-            
-            # Add indexes for performance
-            """CREATE INDEX IF NOT EXISTS idx_user_captcha_records_user_id ON user_captcha_records(user_id)""",
-            """CREATE INDEX IF NOT EXISTS idx_captcha_sessions_user_id ON captcha_sessions(user_id)""",
-            """CREATE INDEX IF NOT EXISTS idx_captcha_sessions_session_id ON captcha_sessions(session_id)""",
-            """CREATE INDEX IF NOT EXISTS idx_captcha_sessions_expires_at ON captcha_sessions(expires_at)""",
-            """CREATE INDEX IF NOT EXISTS idx_winner_selection_logs_giveaway_id ON winner_selection_logs(giveaway_id)"""
-        ]
-        
-        for update in schema_updates:
-            db.session.execute(text(update))
-        
+        # One round-trip: exec_driver_sql sends the string as-is (no bind
+        # parameters), so the driver runs every statement in it
+        db.session.connection().exec_driver_sql(_SCHEMA_BATCH)
         db.session.commit()
         
+        # Re-check for participant_counters on the next stats call
+        global _counters_available
+        _counters_available = None
+        
+        logger.debug("Applied %d schema statements", len(_SCHEMA_UPDATES))
         logger.info("Database schema updated successfully for Bot Service integration")
         
         return jsonify({
             'success': True,
             'message': 'Database schema updated successfully for Bot Service integration',
-            'tables_created': ['user_captcha_records', 'captcha_sessions', 'winner_selection_logs'],
-            'indexes_created': ['user_id', 'session_id', 'expires_at', 'giveaway_id'],
-            'timestamp': datetime.utcnow().isoformat()
+            'tables_created': ['user_captcha_records', 'captcha_sessions', 'winner_selection_logs', 'participant_counters'],
+            'indexes_created': ['user_id', 'session_id', 'expires_at', 'giveaway_id', 'captcha_active', 'ucr_completed_at', 'participated_at', 'winners', 'eligible'],
+            'timestamp': datetime.now(timezone.utc)
         }), 200
         
     except Exception as e:
-        logger.error(f"Schema update failed: {e}")
+        logger.exception("Schema update failed")
         db.session.rollback()
-        return jsonify({
-            'success': False,
-            'error': f'Schema update failed: {str(e)}',
-            'error_code': 'SCHEMA_UPDATE_FAILED'
-        }), 500
+        return _err('SCHEMA_UPDATE_FAILED', f'Schema update failed: {str(e)}')
 
 @admin_optimized_bp.route('/admin/init-db', methods=['POST'])
 def init_database():
     """Initialize database tables"""
+    # create_all already ran for this process (at startup or a prior call)
+    if current_app.config.get('_DB_INITIALIZED'):
+        return jsonify({
+            'success': True,
+            'message': 'Database tables already initialized',
+            'cached': True,
+            'service': 'participant-service'
+        }), 200
+    
     try:
         # Create all tables
         db.create_all()
         db.session.commit()
+        current_app.config['_DB_INITIALIZED'] = True
         
         logger.info("Database tables created successfully")
         
@@ -103,47 +298,62 @@ def init_database():
         }), 200
         
     except Exception as e:
-        logger.error(f"Database initialization failed: {e}")
+        logger.exception("Database initialization failed")
         db.session.rollback()
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'service': 'participant-service'
-        }), 500
+        return _err('DB_INIT_FAILED', str(e))
+
+_PARTICIPANTS_TABLE_INFO = text("""
+    SELECT to_regclass('public.participants') IS NOT NULL AS exists,
+           (SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass('public.participants')) AS estimate
+""")
+
+@lru_cache(maxsize=1)
+def _database_status_payload(bucket):
+    """db-status body; memoized per time bucket (see database_status)"""
+    # The catalog query doubles as the connectivity check. It runs on a
+    # pooled connection outside the session, so there is no transaction to
+    # commit and the connection goes straight back to the pool.
+    with db.engine.connect() as connection:
+        table = connection.execute(_PARTICIPANTS_TABLE_INFO).one()
+    
+    table_info = {}
+    if table.exists:
+        table_info['participants'] = {
+            'exists': True,
+            'record_count': max(table.estimate or 0, 0),
+            'record_count_estimated': True
+        }
+    else:
+        table_info['participants'] = {
+            'exists': False
+        }
+    
+    return {
+        'database_connected': True,
+        'message': 'Database is accessible',
+        'tables': table_info,
+        'service': 'participant-service'
+    }
 
 @admin_optimized_bp.route('/admin/db-status', methods=['GET'])
 def database_status():
     """Fast database status check"""
     try:
-        # Test connection
-        db.session.execute(text('SELECT 1'))
-        db.session.commit()
+        # Reused for DB_STATUS_CACHE_TTL seconds per worker; 0 disables
+        ttl = current_app.config['DB_STATUS_CACHE_TTL']
+        if ttl > 0:
+            payload = _database_status_payload((ttl, int(time.time() // ttl)))
+        else:
+            payload = _database_status_payload.__wrapped__(None)
         
-        # Quick table check
-        table_info = {}
+        # Only a fully healthy result is reused
+        if not all(table['exists'] for table in payload['tables'].values()):
+            _database_status_payload.cache_clear()
         
-        try:
-            from models import Participant
-            count = Participant.query.count()
-            table_info['participants'] = {
-                'exists': True,
-                'record_count': count
-            }
-        except Exception as e:
-            table_info['participants'] = {
-                'exists': False,
-                'error': str(e)
-            }
-        
-        return jsonify({
-            'database_connected': True,
-            'message': 'Database is accessible',
-            'tables': table_info,
-            'service': 'participant-service'
-        }), 200
+        return jsonify(payload), 200
         
     except Exception as e:
-        logger.error(f"Database status check failed: {e}")
+        logger.exception("Database status check failed")
         return jsonify({
             'database_connected': False,
             'error': str(e),
@@ -154,25 +364,20 @@ def database_status():
 def cleanup_data():
     """Run cleanup tasks"""
     try:
-        # Simple cleanup without external dependencies
-        from datetime import datetime, timedelta
-        
         cleanup_results = {
             'expired_captcha_sessions': 0,
             'old_logs': 0,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': datetime.now(timezone.utc)
         }
         
-        # Clean up expired captcha sessions
+        # Same batched, advisory-locked delete the background scheduler runs
         try:
-            expired_sessions = db.session.execute(text(
-                "DELETE FROM captcha_sessions WHERE expires_at < NOW() RETURNING id"
-            )).rowcount
-            cleanup_results['expired_captcha_sessions'] = expired_sessions
+            cleanup_results['expired_captcha_sessions'] = cleanup_tasks.delete_expired_captcha_sessions(
+                batch_size=current_app.config['CLEANUP_BATCH_SIZE']
+            )
         except Exception as e:
-            logger.warning(f"Could not clean captcha sessions: {e}")
-        
-        db.session.commit()
+            db.session.rollback()
+            logger.warning("Could not clean captcha sessions: %s", e)
         
         return jsonify({
             'success': True,
@@ -182,46 +387,59 @@ def cleanup_data():
         }), 200
         
     except Exception as e:
-        logger.error(f"Cleanup failed: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'service': 'participant-service'
-        }), 500
+        logger.exception("Cleanup failed")
+        return _err('CLEANUP_FAILED', str(e))
+
+@lru_cache(maxsize=1)
+def _system_checks():
+    """Exercise captcha generation and winner selection once per process.
+
+    Neither depends on anything that changes at runtime, so the result is
+    kept for the life of the worker instead of re-run on every stats call.
+    """
+    results = {}
+    
+    try:
+        question, answer = captcha_generator.generate_question()
+        results['captcha_generator'] = 'operational' if question and isinstance(answer, int) else 'error'
+    except Exception as e:
+        results['captcha_generator'] = f'error: {str(e)}'
+    
+    try:
+        winners = select_winners_cryptographic([1, 2, 3, 4, 5], 2)
+        results['winner_selection'] = 'operational' if len(winners) == 2 else 'error'
+    except Exception as e:
+        results['winner_selection'] = f'error: {str(e)}'
+    
+    return results
 
 @admin_optimized_bp.route('/admin/stats-fast', methods=['GET'])
 def get_stats_fast():
     """Get fast service statistics without external calls"""
+    return _cached_response('stats_fast', current_app.config.get('STATS_CACHE_TTL', 0), _compute_stats_fast)
+
+def _compute_stats_fast():
     try:
-        from datetime import datetime, timedelta
-        
         stats = {
             'service': 'participant-service',
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': datetime.now(timezone.utc),
             'version': '1.0.0',
             'status': 'healthy'
         }
         
         # Database statistics only
         try:
-            from models import Participant
-            
-            # Basic counts
-            total_participants = Participant.query.count()
-            
-            # Recent activity (last 24 hours)
-            yesterday = datetime.utcnow() - timedelta(days=1)
-            try:
-                recent_participants = Participant.query.filter(Participant.participated_at > yesterday).count()
-            except:
-                recent_participants = 0
+            # Total and recent activity (last 24 hours) in one query
+            yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+            total_participants, total_estimated, recent_participants = participant_counts(yesterday)
             
             stats['database'] = {
                 'status': 'connected',
                 'tables': {
                     'participants': {
                         'exists': True,
-                        'record_count': total_participants
+                        'record_count': total_participants,
+                        'record_count_estimated': total_estimated
                     }
                 },
                 'recent_activity': {
@@ -237,75 +455,42 @@ def get_stats_fast():
             stats['status'] = 'degraded'
         
         # System checks (no external calls)
-        stats['system_checks'] = {}
-        
-        try:
-            # Simple captcha test
-            import random
-            a = random.randint(1, 10)
-            b = random.randint(1, 10)
-            if a and b:
-                stats['system_checks']['captcha_generator'] = 'operational'
-            else:
-                stats['system_checks']['captcha_generator'] = 'error'
-                stats['status'] = 'degraded'
-        except Exception as e:
-            stats['system_checks']['captcha_generator'] = f'error: {str(e)}'
+        stats['system_checks'] = _system_checks()
+        if any(status != 'operational' for status in stats['system_checks'].values()):
             stats['status'] = 'degraded'
         
-        try:
-            # Simple winner selection test
-            import secrets
-            test_participants = [1, 2, 3, 4, 5]
-            winner_index = secrets.randbelow(len(test_participants))
-            if winner_index is not None:
-                stats['system_checks']['winner_selection'] = 'operational'
-            else:
-                stats['system_checks']['winner_selection'] = 'error'
-                stats['status'] = 'degraded'
-        except Exception as e:
-            stats['system_checks']['winner_selection'] = f'error: {str(e)}'
-            stats['status'] = 'degraded'
-        
-        return jsonify(stats), 200
+        return stats, 200
         
     except Exception as e:
-        logger.error(f"Fast stats retrieval failed: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'service': 'participant-service'
-        }), 500
+        logger.exception("Fast stats retrieval failed")
+        return dict(_ERROR_TEMPLATE, error=str(e), error_code='STATS_FAILED'), 500
 
 @admin_optimized_bp.route('/admin/stats', methods=['GET'])
 def get_stats_with_external():
     """Get full service statistics with external services - USE SPARINGLY"""
+    return _cached_response('stats', current_app.config.get('STATS_CACHE_TTL', 0), _compute_stats)
+
+def _compute_stats():
     try:
-        from datetime import datetime, timedelta
-        import requests
-        from concurrent.futures import ThreadPoolExecutor, as_completed
-        
         stats = {
             'service': 'participant-service',
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': datetime.now(timezone.utc),
             'version': '1.0.0',
             'status': 'healthy'
         }
         
         # Database statistics
         try:
-            from models import Participant
-            
-            total_participants = Participant.query.count()
-            yesterday = datetime.utcnow() - timedelta(days=1)
-            recent_participants = Participant.query.filter(Participant.participated_at > yesterday).count()
+            yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+            total_participants, total_estimated, recent_participants = participant_counts(yesterday)
             
             stats['database'] = {
                 'status': 'connected',
                 'tables': {
                     'participants': {
                         'exists': True,
-                        'record_count': total_participants
+                        'record_count': total_participants,
+                        'record_count_estimated': total_estimated
                     }
                 },
                 'recent_activity': {
@@ -320,77 +505,20 @@ def get_stats_with_external():
             }
             stats['status'] = 'degraded'
         
-        # External services check with very short timeout
-        external_services = {
-            'auth_service': 'https://web-production-ddd7e.up.railway.app',
-            'channel_service': 'https://telegive-channel-production.up.railway.app',
-            'telegive_service': 'https://telegive-giveaway-production.up.railway.app'
-        }
-        
-        stats['external_services'] = {}
+        # Hand the connection back to the pool before waiting on the probes
+        db.session.close()
         
-        def check_service(service_name, service_url):
-            try:
-                response = requests.get(f'{service_url}/health', timeout=1)
-                return service_name, {
-                    'url': service_url,
-                    'status_code': response.status_code,
-                    'accessible': response.status_code == 200,
-                    'response_time': response.elapsed.total_seconds()
-                }
-            except Exception as e:
-                return service_name, {
-                    'url': service_url,
-                    'accessible': False,
-                    'error': str(e)
-                }
-        
-        # Check services in parallel with timeout
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            future_to_service = {
-                executor.submit(check_service, name, url): name 
-                for name, url in external_services.items()
-            }
-            
-            for future in as_completed(future_to_service, timeout=2):
-                try:
-                    service_name, result = future.result()
-                    stats['external_services'][service_name] = result
-                except Exception as e:
-                    service_name = future_to_service[future]
-                    stats['external_services'][service_name] = {
-                        'accessible': False,
-                        'error': f'Timeout: {str(e)}'
-                    }
+        # External services check (shared result, see probe_external_services)
+        stats['external_services'] = probe_external_services()
         
         # System checks
-        stats['system_checks'] = {}
-        
-        try:
-            import random
-            a = random.randint(1, 10)
-            b = random.randint(1, 10)
-            stats['system_checks']['captcha_generator'] = 'operational'
-        except Exception as e:
-            stats['system_checks']['captcha_generator'] = f'error: {str(e)}'
+        stats['system_checks'] = _system_checks()
+        if any(status != 'operational' for status in stats['system_checks'].values()):
             stats['status'] = 'degraded'
         
-        try:
-            import secrets
-            test_participants = [1, 2, 3, 4, 5]
-            winner_index = secrets.randbelow(len(test_participants))
-            stats['system_checks']['winner_selection'] = 'operational'
-        except Exception as e:
-            stats['system_checks']['winner_selection'] = f'error: {str(e)}'
-            stats['status'] = 'degraded'
-        
-        return jsonify(stats), 200
+        return stats, 200
         
     except Exception as e:
-        logger.error(f"Stats retrieval failed: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'service': 'participant-service'
-        }), 500
+        logger.exception("Stats retrieval failed")
+        return dict(_ERROR_TEMPLATE, error=str(e), error_code='STATS_FAILED'), 500
 
@@ -1,17 +1,79 @@
 from flask import Blueprint, request, jsonify, current_app
-from datetime import datetime, timedelta
-import secrets
+from datetime import datetime, timedelta, timezone
+import random
 import logging
+import time
+import orjson
 import requests
 import os
+from sqlalchemy import bindparam, exists, func, select, update
+from sqlalchemy.exc import IntegrityError
+from config.settings import (
+    CAPTCHA_MAX_ATTEMPTS, CAPTCHA_TIMEOUT_MINUTES, CAPTCHA_RATE_LIMIT, CAPTCHA_RATE_WINDOW_SECONDS
+)
+from models import (
+    db, dialect_insert, pending_cache_updates, Participant, UserCaptchaRecord, CaptchaSession, WinnerSelectionLog
+)
+from utils.captcha_generator import captcha_generator
+from utils.captcha_token import issue_token, parse_token, answer_matches
+from utils.redis_cache import redis_cache
+from utils.http_cache import encode_json, conditional_response
 
 logger = logging.getLogger(__name__)
 
 bot_service_final_bp = Blueprint('bot_service_final', __name__)
 
+# os.urandom-backed, like secrets
+_system_random = random.SystemRandom()
+
+# Redis-cached reads for the Bot Service polling endpoints. The participant
+# count is kept current by INCR on every committed registration, so its TTL
+# is only the interval at which it is reconciled against the database.
+PARTICIPANT_COUNT_TTL = 3600
+WINNER_COUNT_TTL = 3600
+
+# Polled responses carry an ETag; clients must revalidate, and an unchanged
+# result comes back as an empty 304. Winner selection can be re-run, so
+# winner status is never marked immutable.
+_POLL_HEADERS = {'Cache-Control': 'no-cache'}
+
+# Lifetime of a captcha question (stateless token or session row)
+CAPTCHA_SESSION_TTL = CAPTCHA_TIMEOUT_MINUTES * 60
+
+# Hot read statements, built once at import. Their bound parameters keep
+# one cache key, so SQLAlchemy compiles each statement only once
+_PARTICIPANT_COUNT = select(func.count()).select_from(Participant).where(
+    Participant.giveaway_id == bindparam('giveaway_id')
+)
+
+_WINNER_STATUS_COLUMNS = (Participant.id, Participant.is_winner, Participant.winner_selected_at)
+_WINNER_STATUS_WHERE = (
+    Participant.giveaway_id == bindparam('giveaway_id'),
+    Participant.user_id == bindparam('user_id')
+)
+_WINNER_STATUS = select(*_WINNER_STATUS_COLUMNS).where(*_WINNER_STATUS_WHERE)
+# Same row plus the giveaway's winner count, for a cache miss
+_WINNER_STATUS_WITH_COUNT = select(
+    *_WINNER_STATUS_COLUMNS,
+    select(func.count())
+    .where(Participant.giveaway_id == bindparam('giveaway_id'), Participant.is_winner.is_(True))
+    .scalar_subquery()
+    .label('total_winners')
+).where(*_WINNER_STATUS_WHERE)
+
+# Replayed joins accepted per register-bulk call
+BULK_REGISTER_MAX = 1000
+
+_captcha_status_key = UserCaptchaRecord.status_cache_key
+_participant_count_key = Participant.count_cache_key
+_winner_count_key = Participant.winner_count_cache_key
+
 def log_api_call(endpoint, user_id=None, giveaway_id=None, success=True, error=None):
     """Log all API calls for debugging and analytics"""
-    logger.info(f"API: {endpoint} | User: {user_id} | Giveaway: {giveaway_id} | Success: {success} | Error: {error}")
+    logger.info(
+        "API: %s | User: %s | Giveaway: %s | Success: %s | Error: %s",
+        endpoint, user_id, giveaway_id, success, error
+    )
 
 @bot_service_final_bp.route('/api/v2/participants/captcha-status/<int:user_id>', methods=['GET'])
 def get_captcha_status_v2(user_id):
@@ -20,30 +82,13 @@ def get_captcha_status_v2(user_id):
     Used by Bot Service to optimize participation flow
     """
     try:
-        # Import models and use proper app context
-        from models import db, UserCaptchaRecord
+        payload = {'success': True, **UserCaptchaRecord.cached_status(user_id)}
         
-        captcha_record = UserCaptchaRecord.query.filter_by(user_id=user_id).first()
+        # Return the pooled connection before logging and serializing
+        db.session.close()
         
-        if captcha_record:
-            log_api_call('/api/v2/participants/captcha-status', user_id, None, True, 'STATUS_FOUND')
-            return jsonify({
-                'success': True,
-                'captcha_completed': captcha_record.captcha_completed,
-                'completed_at': captcha_record.captcha_completed_at.isoformat() if captcha_record.captcha_completed_at else None,
-                'total_participations': captcha_record.total_participations,
-                'total_wins': captcha_record.total_wins,
-                'first_participation': captcha_record.first_participation_at.isoformat() if captcha_record.first_participation_at else None
-            }), 200
-        else:
-            # New user
-            log_api_call('/api/v2/participants/captcha-status', user_id, None, True, 'NEW_USER')
-            return jsonify({
-                'success': True,
-                'captcha_completed': False,
-                'total_participations': 0,
-                'total_wins': 0
-            }), 200
+        log_api_call('/api/v2/participants/captcha-status', user_id, None, True, 'STATUS_FOUND' if 'completed_at' in payload else 'NEW_USER')
+        return jsonify(payload), 200
             
     except Exception as e:
         log_api_call('/api/v2/participants/captcha-status', user_id, None, False, str(e))
@@ -60,14 +105,19 @@ def get_winner_status_v2(user_id, giveaway_id):
     Used for VIEW RESULTS functionality
     """
     try:
-        from models import db, Participant
-        
-        # Check if user participated
-        participation = Participant.query.filter_by(
-            giveaway_id=giveaway_id, 
-            user_id=user_id
+        winners_key = _winner_count_key(giveaway_id)
+        total_winners = redis_cache.get_json(winners_key)
+        
+        # The user's participation row, plus the giveaway's winner count on a
+        # cache miss, in one statement
+        statement = _WINNER_STATUS if total_winners is not None else _WINNER_STATUS_WITH_COUNT
+        participation = db.session.execute(
+            statement, {'giveaway_id': giveaway_id, 'user_id': user_id}
         ).first()
         
+        # Return the pooled connection before logging and serializing
+        db.session.close()
+        
         if not participation:
             log_api_call('/api/v2/participants/winner-status', user_id, giveaway_id, True, 'USER_NOT_PARTICIPATED')
             return jsonify({
@@ -77,21 +127,20 @@ def get_winner_status_v2(user_id, giveaway_id):
                 'message': 'User did not participate in this giveaway'
             }), 200
         
-        # Get total winner count
-        total_winners = Participant.query.filter_by(
-            giveaway_id=giveaway_id, 
-            is_winner=True
-        ).count()
+        if total_winners is None:
+            total_winners = participation.total_winners
+            redis_cache.set_json(winners_key, total_winners, WINNER_COUNT_TTL)
         
         log_api_call('/api/v2/participants/winner-status', user_id, giveaway_id, True, f'WINNER_STATUS_{participation.is_winner}')
-        return jsonify({
+        body, etag = encode_json({
             'success': True,
             'participated': True,
             'is_winner': participation.is_winner,
-            'winner_selected_at': participation.winner_selected_at.isoformat() if participation.winner_selected_at else None,
+            'winner_selected_at': participation.winner_selected_at,
             'total_winners': total_winners,
             'participant_id': participation.id
-        }), 200
+        })
+        return conditional_response(body, etag, headers=_POLL_HEADERS)
         
     except Exception as e:
         log_api_call('/api/v2/participants/winner-status', user_id, giveaway_id, False, str(e))
@@ -101,6 +150,16 @@ def get_winner_status_v2(user_id, giveaway_id):
             'error_code': 'WINNER_STATUS_ERROR'
         }), 500
 
+def _participant_count(giveaway_id):
+    """Giveaway participant count, from the Redis counter when cached"""
+    cache_key = _participant_count_key(giveaway_id)
+    count = redis_cache.get_json(cache_key)
+    
+    if count is None:
+        count = db.session.scalar(_PARTICIPANT_COUNT, {'giveaway_id': giveaway_id})
+        redis_cache.set_json(cache_key, count, PARTICIPANT_COUNT_TTL)
+    return count
+
 @bot_service_final_bp.route('/api/v2/participants/count/<int:giveaway_id>', methods=['GET'])
 def get_participant_count_v2(giveaway_id):
     """
@@ -108,16 +167,18 @@ def get_participant_count_v2(giveaway_id):
     Used for real-time participant counter
     """
     try:
-        from models import db, Participant
+        count = _participant_count(giveaway_id)
         
-        count = Participant.query.filter_by(giveaway_id=giveaway_id).count()
+        # Return the pooled connection before logging and serializing
+        db.session.close()
         
         log_api_call('/api/v2/participants/count', None, giveaway_id, True, f'COUNT_{count}')
-        return jsonify({
+        body, etag = encode_json({
             'success': True,
             'giveaway_id': giveaway_id,
             'count': count
-        }), 200
+        })
+        return conditional_response(body, etag, headers=_POLL_HEADERS)
         
     except Exception as e:
         log_api_call('/api/v2/participants/count', None, giveaway_id, False, str(e))
@@ -134,8 +195,6 @@ def register_participant_v2():
     Handles both new users (captcha required) and returning users
     """
     try:
-        from models import db, Participant, UserCaptchaRecord, CaptchaSession
-        
         data = request.get_json()
         
         # Validate required fields
@@ -155,13 +214,18 @@ def register_participant_v2():
         first_name = data.get('first_name')
         last_name = data.get('last_name')
         
-        # Check for duplicate participation
-        existing = Participant.query.filter_by(
-            giveaway_id=giveaway_id, 
-            user_id=user_id
-        ).first()
-        
-        if existing:
+        # Duplicate check and global captcha status in one round-trip
+        status = db.session.execute(select(
+            exists()
+            .where(Participant.giveaway_id == giveaway_id, Participant.user_id == user_id)
+            .label('already_participating'),
+            select(UserCaptchaRecord.captcha_completed)
+            .where(UserCaptchaRecord.user_id == user_id)
+            .scalar_subquery()
+            .label('captcha_completed')
+        )).one()
+        
+        if status.already_participating:
             log_api_call('/api/v2/participants/register', user_id, giveaway_id, False, 'DUPLICATE_PARTICIPATION')
             return jsonify({
                 'success': False,
@@ -169,28 +233,34 @@ def register_participant_v2():
                 'error_code': 'DUPLICATE_PARTICIPATION'
             }), 409
         
-        # Check if user has completed captcha globally
-        captcha_record = UserCaptchaRecord.query.filter_by(user_id=user_id).first()
-        
-        if not captcha_record or not captcha_record.captcha_completed:
+        if not status.captcha_completed and redis_cache.enabled:
+            # New user - stateless captcha session, nothing is written until
+            # the question is answered
+            question, answer = captcha_generator.generate_addition_question()
+            session_id = issue_token(_captcha_token_key(), user_id, giveaway_id, answer, CAPTCHA_SESSION_TTL)
+            
+            log_api_call('/api/v2/participants/register', user_id, giveaway_id, True, 'CAPTCHA_REQUIRED')
+            return jsonify({
+                'success': True,
+                'requires_captcha': True,
+                'captcha_question': question,
+                'session_id': session_id,
+                'message': 'First-time participation requires verification'
+            }), 200
+        elif not status.captcha_completed:
             # New user - generate captcha
-            import random
             a = random.randint(1, 10)
             b = random.randint(1, 10)
             question = f"What is {a} + {b}?"
             answer = a + b
             
             # Create captcha session
-            session_id = secrets.token_urlsafe(16)
-            expires_at = datetime.utcnow() + timedelta(minutes=10)
-            
-            captcha_session = CaptchaSession(
+            captcha_session = CaptchaSession.create_session(
                 user_id=user_id,
                 giveaway_id=giveaway_id,
-                session_id=session_id,
                 question=question,
                 correct_answer=answer,
-                expires_at=expires_at
+                timeout_minutes=CAPTCHA_TIMEOUT_MINUTES
             )
             
             db.session.add(captcha_session)
@@ -201,7 +271,7 @@ def register_participant_v2():
                 'success': True,
                 'requires_captcha': True,
                 'captcha_question': question,
-                'session_id': session_id,
+                'session_id': f'sess_{captcha_session.id}',
                 'message': 'First-time participation requires verification'
             }), 200
         else:
@@ -218,10 +288,28 @@ def register_participant_v2():
             
             db.session.add(participant)
             
-            # Update user statistics
-            captcha_record.total_participations += 1
+            # Update user statistics without loading the record
+            db.session.execute(
+                update(UserCaptchaRecord)
+                .where(UserCaptchaRecord.user_id == user_id)
+                .values(total_participations=UserCaptchaRecord.total_participations + 1)
+            )
             
-            db.session.commit()
+            try:
+                db.session.commit()
+            except IntegrityError:
+                # A concurrent request registered the same user first;
+                # uq_giveaway_user makes the insert the real duplicate check
+                db.session.rollback()
+                log_api_call('/api/v2/participants/register', user_id, giveaway_id, False, 'DUPLICATE_PARTICIPATION')
+                return jsonify({
+                    'success': False,
+                    'error': 'User already participating in this giveaway',
+                    'error_code': 'DUPLICATE_PARTICIPATION'
+                }), 409
+            
+            # Bulk updates bypass the session cache hooks
+            redis_cache.delete(_captcha_status_key(user_id))
             
             log_api_call('/api/v2/participants/register', user_id, giveaway_id, True, 'PARTICIPATION_CONFIRMED')
             return jsonify({
@@ -243,6 +331,265 @@ def register_participant_v2():
             'error_code': 'REGISTRATION_ERROR'
         }), 500
 
+_BULK_NAME_FIELDS = ('username', 'first_name', 'last_name')
+
+def _is_positive_int(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+def _bulk_entry_error(user):
+    """Why one bulk participants entry is malformed, or None if it is valid"""
+    if not isinstance(user, dict):
+        return 'must be an object'
+    if not _is_positive_int(user.get('user_id')):
+        return 'user_id must be a positive integer'
+    for field in _BULK_NAME_FIELDS:
+        if user.get(field) is not None and not isinstance(user[field], str):
+            return f'{field} must be a string'
+    return None
+
+@bot_service_final_bp.route('/api/v2/participants/register-bulk', methods=['POST'])
+def register_participants_bulk_v2():
+    """
+    Register a batch of participants for one giveaway in a single transaction
+    Used by the Bot Service to replay joins queued during an outage; users
+    who have not completed a captcha are reported back, not registered
+    """
+    giveaway_id = None
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            log_api_call('/api/v2/participants/register-bulk', None, None, False, 'INVALID_BATCH')
+            return jsonify({
+                'success': False,
+                'error': 'Request body must be a JSON object',
+                'error_code': 'INVALID_BATCH'
+            }), 400
+        
+        giveaway_id = data.get('giveaway_id')
+        users = data.get('participants')
+        if not _is_positive_int(giveaway_id) or not isinstance(users, list) or not users:
+            log_api_call('/api/v2/participants/register-bulk', None, giveaway_id, False, 'INVALID_BATCH')
+            return jsonify({
+                'success': False,
+                'error': 'An integer giveaway_id and a non-empty participants list are required',
+                'error_code': 'INVALID_BATCH'
+            }), 400
+        
+        if len(users) > BULK_REGISTER_MAX:
+            log_api_call('/api/v2/participants/register-bulk', None, giveaway_id, False, 'BATCH_TOO_LARGE')
+            return jsonify({
+                'success': False,
+                'error': f'At most {BULK_REGISTER_MAX} participants per request',
+                'error_code': 'BATCH_TOO_LARGE'
+            }), 400
+        
+        for index, user in enumerate(users):
+            error = _bulk_entry_error(user)
+            if error:
+                log_api_call('/api/v2/participants/register-bulk', None, giveaway_id, False, 'INVALID_PARTICIPANT')
+                return jsonify({
+                    'success': False,
+                    'error': f'participants[{index}]: {error}',
+                    'error_code': 'INVALID_PARTICIPANT'
+                }), 400
+        
+        # Last entry wins for repeated user_ids
+        by_user = {user['user_id']: user for user in users}
+        
+        verified = set(db.session.scalars(
+            select(UserCaptchaRecord.user_id)
+            .where(UserCaptchaRecord.user_id.in_(by_user), UserCaptchaRecord.captcha_completed.is_(True))
+        ))
+        
+        rows = [
+            {
+                'giveaway_id': giveaway_id,
+                'user_id': user_id,
+                'username': user.get('username'),
+                'first_name': user.get('first_name'),
+                'last_name': user.get('last_name'),
+                'captcha_completed': True,
+                'subscription_verified': True
+            }
+            for user_id, user in by_user.items() if user_id in verified
+        ]
+        
+        registered = []
+        if rows:
+            # One multi-row INSERT; rows already in the giveaway are skipped
+            registered = list(db.session.scalars(
+                dialect_insert(Participant)
+                .values(rows)
+                .on_conflict_do_nothing(index_elements=['giveaway_id', 'user_id'])
+                .returning(Participant.user_id)
+            ))
+        
+        if registered:
+            db.session.execute(
+                update(UserCaptchaRecord)
+                .where(UserCaptchaRecord.user_id.in_(registered))
+                .values(total_participations=UserCaptchaRecord.total_participations + 1)
+            )
+        db.session.commit()
+        
+        # Core statements bypass the session cache hooks
+        if registered:
+            redis_cache.delete(
+                _participant_count_key(giveaway_id),
+                *(_captcha_status_key(user_id) for user_id in registered)
+            )
+        
+        registered_set = set(registered)
+        log_api_call('/api/v2/participants/register-bulk', None, giveaway_id, True, f'REGISTERED_{len(registered)}')
+        return jsonify({
+            'success': True,
+            'registered': registered,
+            'already_participating': [
+                user_id for user_id in by_user if user_id in verified and user_id not in registered_set
+            ],
+            'requires_captcha': [user_id for user_id in by_user if user_id not in verified]
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        log_api_call('/api/v2/participants/register-bulk', None, giveaway_id, False, str(e))
+        return jsonify({
+            'success': False,
+            'error': f'Bulk registration failed: {str(e)}',
+            'error_code': 'BULK_REGISTRATION_ERROR'
+        }), 500
+
+def _captcha_token_key():
+    return current_app.config['SECRET_KEY'].encode()
+
+def _captcha_session_row_id(session_id):
+    """CaptchaSession id from a database-backed 'sess_<id>' session id, else None"""
+    if isinstance(session_id, str) and session_id.startswith('sess_') and session_id[5:].isdigit():
+        return int(session_id[5:])
+    return None
+
+def _complete_captcha(data, user_id, giveaway_id):
+    """Mark the user's captcha completed and add their participation (not committed)"""
+    now = datetime.now(timezone.utc)
+    
+    # One upsert instead of SELECT then INSERT/UPDATE; also closes the
+    # read-modify-write race on total_participations
+    db.session.execute(
+        dialect_insert(UserCaptchaRecord)
+        .values(
+            user_id=user_id,
+            captcha_completed=True,
+            captcha_completed_at=now,
+            first_participation_at=now,
+            total_participations=1,
+            total_wins=0
+        )
+        .on_conflict_do_update(
+            index_elements=[UserCaptchaRecord.user_id],
+            set_={
+                'captcha_completed': True,
+                'captcha_completed_at': now,
+                'total_participations': UserCaptchaRecord.total_participations + 1
+            }
+        )
+    )
+    # Core statements bypass the flush hooks, so queue the invalidation here
+    pending_cache_updates(db.session)['delete'].add(_captcha_status_key(user_id))
+    
+    # Create participation record
+    participant = Participant(
+        giveaway_id=giveaway_id,
+        user_id=user_id,
+        username=data.get('username'),
+        first_name=data.get('first_name'),
+        last_name=data.get('last_name'),
+        captcha_completed=True,
+        subscription_verified=True
+    )
+    
+    db.session.add(participant)
+    return participant
+
+def _validate_captcha_token(data, token):
+    """validate-captcha for a stateless session token; attempts are counted in Redis"""
+    user_id = data['user_id']
+    giveaway_id = data['giveaway_id']
+    expires, nonce, _ = token
+    
+    remaining_ttl = expires - int(time.time())
+    if remaining_ttl <= 0:
+        log_api_call('/api/v2/participants/validate-captcha', user_id, giveaway_id, False, 'CAPTCHA_EXPIRED')
+        return jsonify({
+            'success': False,
+            'error': 'Captcha session expired, please try again',
+            'error_code': 'CAPTCHA_EXPIRED'
+        }), 410
+    
+    # Every answer counts, so a token cannot be replayed past the limit.
+    # Without the counter an answer cannot be accepted safely.
+    attempts = redis_cache.incr(f'captcha:att:{nonce}', remaining_ttl)
+    if attempts is None:
+        log_api_call('/api/v2/participants/validate-captcha', user_id, giveaway_id, False, 'CAPTCHA_UNAVAILABLE')
+        return jsonify({
+            'success': False,
+            'error': 'Captcha validation temporarily unavailable, please retry',
+            'error_code': 'CAPTCHA_UNAVAILABLE'
+        }), 503
+    if attempts > CAPTCHA_MAX_ATTEMPTS:
+        log_api_call('/api/v2/participants/validate-captcha', user_id, giveaway_id, False, 'CAPTCHA_EXPIRED')
+        return jsonify({
+            'success': False,
+            'error': 'Captcha session expired, please try again',
+            'error_code': 'CAPTCHA_EXPIRED'
+        }), 410
+    
+    if answer_matches(_captcha_token_key(), token, user_id, giveaway_id, data['answer']):
+        participant = _complete_captcha(data, user_id, giveaway_id)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # The token was already redeemed for this giveaway
+            db.session.rollback()
+            log_api_call('/api/v2/participants/validate-captcha', user_id, giveaway_id, False, 'DUPLICATE_PARTICIPATION')
+            return jsonify({
+                'success': False,
+                'error': 'User already participating in this giveaway',
+                'error_code': 'DUPLICATE_PARTICIPATION'
+            }), 409
+        
+        log_api_call('/api/v2/participants/validate-captcha', user_id, giveaway_id, True, 'CAPTCHA_COMPLETED')
+        return jsonify({
+            'success': True,
+            'captcha_completed': True,
+            'participation_confirmed': True,
+            'participant_id': participant.id,
+            'message': 'Verification complete! Participation confirmed.'
+        }), 200
+    
+    if attempts >= CAPTCHA_MAX_ATTEMPTS:
+        # Generate new question after max attempts
+        question, answer = captcha_generator.generate_addition_question()
+        session_id = issue_token(_captcha_token_key(), user_id, giveaway_id, answer, CAPTCHA_SESSION_TTL)
+        
+        log_api_call('/api/v2/participants/validate-captcha', user_id, giveaway_id, True, 'NEW_QUESTION_GENERATED')
+        return jsonify({
+            'success': True,
+            'captcha_completed': False,
+            'attempts_remaining': CAPTCHA_MAX_ATTEMPTS,
+            'new_question': question,
+            'session_id': session_id,
+            'message': 'New question generated after maximum attempts'
+        }), 200
+    
+    attempts_remaining = CAPTCHA_MAX_ATTEMPTS - attempts
+    log_api_call('/api/v2/participants/validate-captcha', user_id, giveaway_id, True, 'INCORRECT_ANSWER')
+    return jsonify({
+        'success': True,
+        'captcha_completed': False,
+        'attempts_remaining': attempts_remaining,
+        'message': f'Incorrect answer. {attempts_remaining} attempts remaining.'
+    }), 200
+
 @bot_service_final_bp.route('/api/v2/participants/validate-captcha', methods=['POST'])
 def validate_captcha_v2():
     """
@@ -250,8 +597,6 @@ def validate_captcha_v2():
     Handle retry logic and participation confirmation
     """
     try:
-        from models import db, Participant, UserCaptchaRecord, CaptchaSession
-        
         data = request.get_json()
         
         # Validate required fields
@@ -270,12 +615,28 @@ def validate_captcha_v2():
         user_answer = data['answer']
         session_id = data['session_id']
         
+        # Shed brute-force attempts before any database work
+        if not redis_cache.allow(f'rl:captcha:{user_id}', CAPTCHA_RATE_LIMIT, CAPTCHA_RATE_WINDOW_SECONDS):
+            log_api_call('/api/v2/participants/validate-captcha', user_id, giveaway_id, False, 'RATE_LIMITED')
+            return jsonify({
+                'success': False,
+                'error': 'Too many captcha attempts, please slow down',
+                'error_code': 'RATE_LIMITED'
+            }), 429
+        
+        token = parse_token(session_id)
+        if token is not None:
+            return _validate_captcha_token(data, token)
+        
         # Get active captcha session
-        captcha_session = CaptchaSession.query.filter_by(
-            session_id=session_id,
-            user_id=user_id,
-            giveaway_id=giveaway_id
-        ).first()
+        captcha_session = None
+        row_id = _captcha_session_row_id(session_id)
+        if row_id is not None:
+            captcha_session = CaptchaSession.query.filter_by(
+                id=row_id,
+                user_id=user_id,
+                giveaway_id=giveaway_id
+            ).first()
         
         if not captcha_session:
             log_api_call('/api/v2/participants/validate-captcha', user_id, giveaway_id, False, 'CAPTCHA_SESSION_NOT_FOUND')
@@ -286,7 +647,7 @@ def validate_captcha_v2():
             }), 404
         
         # Check if session expired
-        if datetime.utcnow() > captcha_session.expires_at:
+        if captcha_session.is_expired():
             db.session.delete(captcha_session)
             db.session.commit()
             log_api_call('/api/v2/participants/validate-captcha', user_id, giveaway_id, False, 'CAPTCHA_EXPIRED')
@@ -297,37 +658,9 @@ def validate_captcha_v2():
             }), 410
         
         # Validate answer
-        if user_answer == captcha_session.correct_answer:
+        if captcha_generator.validate_answer(user_answer, captcha_session.correct_answer):
             # Correct answer - complete captcha globally
-            captcha_record = UserCaptchaRecord.query.filter_by(user_id=user_id).first()
-            
-            if captcha_record:
-                captcha_record.captcha_completed = True
-                captcha_record.captcha_completed_at = datetime.utcnow()
-                captcha_record.total_participations += 1
-            else:
-                captcha_record = UserCaptchaRecord(
-                    user_id=user_id,
-                    captcha_completed=True,
-                    captcha_completed_at=datetime.utcnow(),
-                    first_participation_at=datetime.utcnow(),
-                    total_participations=1,
-                    total_wins=0
-                )
-                db.session.add(captcha_record)
-            
-            # Create participation record
-            participant = Participant(
-                giveaway_id=giveaway_id,
-                user_id=user_id,
-                username=data.get('username'),
-                first_name=data.get('first_name'),
-                last_name=data.get('last_name'),
-                captcha_completed=True,
-                subscription_verified=True
-            )
-            
-            db.session.add(participant)
+            participant = _complete_captcha(data, user_id, giveaway_id)
             
             # Clean up captcha session
             db.session.delete(captcha_session)
@@ -348,7 +681,6 @@ def validate_captcha_v2():
             
             if captcha_session.attempts >= captcha_session.max_attempts:
                 # Generate new question after max attempts
-                import random
                 a = random.randint(1, 10)
                 b = random.randint(1, 10)
                 question = f"What is {a} + {b}?"
@@ -357,7 +689,7 @@ def validate_captcha_v2():
                 captcha_session.question = question
                 captcha_session.correct_answer = answer
                 captcha_session.attempts = 0
-                captcha_session.expires_at = datetime.utcnow() + timedelta(minutes=10)
+                captcha_session.expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)
                 
                 db.session.commit()
                 
@@ -399,8 +731,6 @@ def select_winners_v2():
     Called by Giveaway Service when finishing giveaway
     """
     try:
-        from models import db, Participant, UserCaptchaRecord, WinnerSelectionLog
-        
         data = request.get_json()
         
         # Validate required fields
@@ -418,8 +748,8 @@ def select_winners_v2():
         winner_count = data['winner_count']
         selection_method = data.get('selection_method', 'cryptographic_random')
         
-        # Get all eligible participants
-        eligible_participants = Participant.query.filter_by(
+        # Get all eligible participants (only the columns selection needs)
+        eligible_participants = db.session.query(Participant.id, Participant.user_id).filter_by(
             giveaway_id=giveaway_id,
             captcha_completed=True,
             subscription_verified=True
@@ -437,24 +767,18 @@ def select_winners_v2():
         actual_winner_count = min(winner_count, total_participants)
         
         # Perform cryptographically secure selection
-        participant_ids = [p.id for p in eligible_participants]
-        selected_indices = set()
-        
-        while len(selected_indices) < actual_winner_count:
-            random_index = secrets.randbelow(len(participant_ids))
-            selected_indices.add(random_index)
-        
-        selected_ids = [participant_ids[i] for i in selected_indices]
-        
-        # Update winner status
-        selection_timestamp = datetime.utcnow()
-        winner_user_ids = []
-        
-        for participant in eligible_participants:
-            if participant.id in selected_ids:
-                participant.is_winner = True
-                participant.winner_selected_at = selection_timestamp
-                winner_user_ids.append(participant.user_id)
+        # (one collision-free draw from the OS CSPRNG, no retry loop)
+        selected_indices = _system_random.sample(range(total_participants), actual_winner_count)
+        selected_ids = {eligible_participants[i].id for i in selected_indices}
+        winner_user_ids = [eligible_participants[i].user_id for i in selected_indices]
+        
+        # Update winner status in one statement
+        selection_timestamp = datetime.now(timezone.utc)
+        db.session.execute(
+            update(Participant)
+            .where(Participant.id.in_(selected_ids))
+            .values(is_winner=True, winner_selected_at=selection_timestamp)
+        )
         
         # Log selection for audit
         selection_log = WinnerSelectionLog(
@@ -469,14 +793,21 @@ def select_winners_v2():
         
         db.session.add(selection_log)
         
-        # Update user win statistics
-        for user_id in winner_user_ids:
-            captcha_record = UserCaptchaRecord.query.filter_by(user_id=user_id).first()
-            if captcha_record:
-                captcha_record.total_wins += 1
+        # Update user win statistics in one statement
+        db.session.execute(
+            update(UserCaptchaRecord)
+            .where(UserCaptchaRecord.user_id.in_(winner_user_ids))
+            .values(total_wins=UserCaptchaRecord.total_wins + 1)
+        )
         
         db.session.commit()
         
+        # Bulk updates bypass the session cache hooks
+        redis_cache.delete(
+            _winner_count_key(giveaway_id),
+            *(_captcha_status_key(user_id) for user_id in winner_user_ids)
+        )
+        
         log_api_call('/api/v2/participants/select-winners', None, giveaway_id, True, f'SELECTED_{actual_winner_count}_WINNERS')
         return jsonify({
             'success': True,
@@ -484,7 +815,7 @@ def select_winners_v2():
             'total_participants': total_participants,
             'winner_count_requested': winner_count,
             'winner_count_selected': actual_winner_count,
-            'selection_timestamp': selection_timestamp.isoformat(),
+            'selection_timestamp': selection_timestamp,
             'selection_method': selection_method
         }), 200
         
@@ -505,33 +836,48 @@ def get_participant_list_v2(giveaway_id):
     """
     Get paginated participant list for giveaway
     Used by Dashboard Service for participant management
+    
+    Pass ?after_id=<next_after_id of the previous page> (0 for the first)
+    for keyset pagination; ?page=N is still accepted but deep pages are
+    slow since OFFSET scans every skipped row.
     """
     try:
-        from models import db, Participant
-        
         page = request.args.get('page', 1, type=int)
+        after_id = request.args.get('after_id', type=int)
         limit = request.args.get('limit', 50, type=int)
         
         # Limit maximum page size
         limit = min(limit, 100)
         
-        participants_query = Participant.query.filter_by(giveaway_id=giveaway_id)
-        total_count = participants_query.count()
-        
-        participants = participants_query.offset((page - 1) * limit).limit(limit).all()
-        
-        participant_list = [p.to_dict() for p in participants]
+        total_count = _participant_count(giveaway_id)
         
-        log_api_call('/api/v2/participants/list', None, giveaway_id, True, f'PAGE_{page}_LIMIT_{limit}')
-        return jsonify({
-            'success': True,
-            'participants': participant_list,
-            'pagination': {
+        if after_id is not None:
+            participants_json, next_after_id = Participant.page_after_as_json(giveaway_id, limit, after_id)
+            pagination = {
+                'after_id': after_id,
+                'next_after_id': next_after_id,
+                'limit': limit,
+                'total': total_count
+            }
+            page_label = f'AFTER_{after_id}'
+        else:
+            participants_json = Participant.page_as_json(giveaway_id, limit, (page - 1) * limit)
+            pagination = {
                 'page': page,
                 'limit': limit,
                 'total': total_count,
                 'pages': (total_count + limit - 1) // limit
             }
+            page_label = f'PAGE_{page}'
+        
+        # Return the pooled connection before logging and serializing
+        db.session.close()
+        
+        log_api_call('/api/v2/participants/list', None, giveaway_id, True, f'{page_label}_LIMIT_{limit}')
+        return jsonify({
+            'success': True,
+            'participants': orjson.Fragment(participants_json),
+            'pagination': pagination
         }), 200
         
     except Exception as e:
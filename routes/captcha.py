@@ -1,11 +1,187 @@
-from flask import Blueprint, request, jsonify
-from datetime import datetime
-from models import db, CaptchaSession, UserCaptchaRecord, Participant
+from flask import Blueprint, request, jsonify, current_app
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import bindparam, select
+from models import db, dialect_insert, CaptchaSession, UserCaptchaRecord, Participant
 from utils.captcha_generator import captcha_generator
 from utils.validation import input_validator
+from utils.redis_cache import redis_cache
+from utils.subscription_checker import subscription_checker
+from services.telegive_service import telegive_service
+from tasks.cleanup_tasks import cleanup_tasks
+from config.settings import CAPTCHA_RATE_LIMIT, CAPTCHA_RATE_WINDOW_SECONDS
 
 captcha_bp = Blueprint('captcha', __name__)
 
+# Prebuilt statements for the hot captcha lookups, bound per request so they
+# hit the compiled-statement cache instead of being rebuilt each call
+_ACTIVE_SESSION = select(CaptchaSession, UserCaptchaRecord).outerjoin(
+    UserCaptchaRecord, UserCaptchaRecord.user_id == CaptchaSession.user_id
+).where(
+    CaptchaSession.user_id == bindparam('user_id'),
+    CaptchaSession.giveaway_id == bindparam('giveaway_id'),
+    CaptchaSession.completed.is_(False)
+).order_by(CaptchaSession.created_at.desc()).limit(1)
+
+_CAPTCHA_RECORD = select(UserCaptchaRecord).where(UserCaptchaRecord.user_id == bindparam('user_id'))
+
+_PARTICIPANT_ID = select(Participant.id).where(
+    Participant.giveaway_id == bindparam('giveaway_id'),
+    Participant.user_id == bindparam('user_id')
+)
+
+def _session_key(user_id, giveaway_id):
+    return f'cs:{user_id}:{giveaway_id}'
+
+def _start_session(user_id, giveaway_id, captcha_data):
+    """Store a new captcha session and return (session_id, expires_at).
+
+    Sessions live in a Redis hash expiring with the question when Redis is
+    reachable, otherwise in a CaptchaSession row left for the caller to commit.
+    """
+    ttl = captcha_data['timeout_minutes'] * 60
+    stored = redis_cache.set_hash(_session_key(user_id, giveaway_id), {
+        'answer': captcha_data['correct_answer'],
+        'attempts': 0,
+        'max_attempts': captcha_data['max_attempts']
+    }, ttl)
+    if stored:
+        return f'cs_{user_id}_{giveaway_id}', datetime.now(timezone.utc) + timedelta(seconds=ttl)
+    
+    captcha_session = CaptchaSession.create_session(
+        user_id=user_id,
+        giveaway_id=giveaway_id,
+        question=captcha_data['question'],
+        correct_answer=captcha_data['correct_answer'],
+        timeout_minutes=captcha_data['timeout_minutes']
+    )
+    db.session.add(captcha_session)
+    db.session.flush()
+    return f'sess_{captcha_session.id}', captcha_session.expires_at
+
+def _confirm_participation(user_id, giveaway_id, captcha_record, session_key=None):
+    """Record the solved captcha and register the user for the giveaway.
+
+    The subscription is verified before anything is written, so a failure
+    leaves the captcha session open for a retry. The captcha record, the
+    session and the participant are then committed together. session_key
+    names a Redis-held session, dropped once that commit succeeds.
+    """
+    # Verify subscription
+    giveaway = telegive_service.get_giveaway(giveaway_id)
+    if not giveaway:
+        return jsonify({
+            'success': False,
+            'error': 'Giveaway not found',
+            'error_code': 'GIVEAWAY_NOT_FOUND'
+        }), 404
+    
+    account_id = giveaway.get('account_id')
+    subscription_result = subscription_checker.verify_subscription(user_id, account_id)
+    
+    if not subscription_result.get('success'):
+        return jsonify({
+            'success': False,
+            'error': subscription_result.get('error', 'Subscription verification failed'),
+            'error_code': subscription_result.get('error_code', 'SUBSCRIPTION_ERROR')
+        }), 400
+    
+    if not subscription_result.get('is_subscribed'):
+        return jsonify({
+            'success': False,
+            'error': 'User is not subscribed to the required channel',
+            'error_code': 'USER_NOT_SUBSCRIBED',
+            'channel_info': subscription_result.get('channel_info')
+        }), 400
+    
+    now = datetime.now(timezone.utc)
+    
+    # Update or create user captcha record
+    if captcha_record:
+        if not captcha_record.captcha_completed:
+            captcha_record.captcha_completed = True
+            captcha_record.captcha_completed_at = now
+    else:
+        captcha_record = UserCaptchaRecord(
+            user_id=user_id,
+            captcha_completed=True,
+            captcha_completed_at=now,
+            total_participations=0
+        )
+        db.session.add(captcha_record)
+    
+    # Create participant record; the (giveaway_id, user_id) unique
+    # constraint makes the insert itself the duplicate check
+    participant_id = db.session.execute(
+        dialect_insert(Participant).values(
+            giveaway_id=giveaway_id,
+            user_id=user_id,
+            captcha_completed=True,
+            subscription_verified=True,
+            subscription_verified_at=now
+        ).on_conflict_do_nothing(
+            index_elements=['giveaway_id', 'user_id']
+        ).returning(Participant.id)
+    ).scalar()
+    
+    if participant_id is not None:
+        # Update user captcha record participation count
+        captcha_record.total_participations += 1
+        captcha_record.last_participation_at = now
+    
+    db.session.commit()
+    
+    if session_key is not None:
+        redis_cache.delete(session_key)
+    
+    if participant_id is None:
+        # User already participated
+        existing_id = db.session.scalar(_PARTICIPANT_ID, {'giveaway_id': giveaway_id, 'user_id': user_id})
+        return jsonify({
+            'success': True,
+            'captcha_completed': True,
+            'participation_confirmed': True,
+            'participant_id': existing_id,
+            'note': 'User already participated'
+        })
+    
+    # Core inserts bypass the session cache hooks
+    redis_cache.incr_if_exists(Participant.count_cache_key(giveaway_id))
+    
+    return jsonify({
+        'success': True,
+        'captcha_completed': True,
+        'participation_confirmed': True,
+        'participant_id': participant_id
+    })
+
+def _reject_answer(user_id, giveaway_id, attempts_remaining):
+    """Answer a wrong guess, replacing the question once attempts run out.
+
+    The counted attempt and any replacement session are written in one commit.
+    """
+    if attempts_remaining <= 0:
+        # Generate new question after max attempts
+        new_captcha_data = captcha_generator.generate_captcha_data()
+        _start_session(user_id, giveaway_id, new_captcha_data)
+        db.session.commit()
+        
+        return jsonify({
+            'success': False,
+            'captcha_completed': False,
+            'error': 'Maximum attempts exceeded. New question generated.',
+            'attempts_remaining': new_captcha_data['max_attempts'],
+            'new_question': new_captcha_data['question']
+        })
+    
+    db.session.commit()
+    
+    return jsonify({
+        'success': False,
+        'captcha_completed': False,
+        'error': 'Incorrect answer',
+        'attempts_remaining': attempts_remaining
+    })
+
 @captcha_bp.route('/api/participants/validate-captcha', methods=['POST'])
 def validate_captcha():
     """Validate captcha answer"""
@@ -26,20 +202,47 @@ def validate_captcha():
         giveaway_id = validated_data['giveaway_id']
         answer = validated_data['answer']
         
-        # Find active captcha session
-        captcha_session = CaptchaSession.query.filter_by(
-            user_id=user_id,
-            giveaway_id=giveaway_id,
-            completed=False
-        ).order_by(CaptchaSession.created_at.desc()).first()
+        # Shed brute-force attempts before any database work
+        if not redis_cache.allow(f'rl:captcha:{user_id}', CAPTCHA_RATE_LIMIT, CAPTCHA_RATE_WINDOW_SECONDS):
+            return jsonify({
+                'success': False,
+                'error': 'Too many captcha attempts, please slow down',
+                'error_code': 'RATE_LIMITED'
+            }), 429
+        
+        # A Redis-held session is counted and read in one atomic call; an
+        # expired one is simply gone
+        session_key = _session_key(user_id, giveaway_id)
+        state = redis_cache.incr_hash(session_key, 'attempts', ('answer', 'attempts', 'max_attempts'))
+        if state is not None:
+            correct_answer, attempts, max_attempts = (int(value) for value in state)
+            
+            if attempts > max_attempts:
+                return jsonify({
+                    'success': False,
+                    'error': 'Maximum attempts exceeded',
+                    'error_code': 'CAPTCHA_ATTEMPTS_EXCEEDED'
+                }), 400
+            
+            if captcha_generator.validate_answer(str(answer), correct_answer):
+                captcha_record = db.session.scalars(_CAPTCHA_RECORD, {'user_id': user_id}).first()
+                return _confirm_participation(user_id, giveaway_id, captcha_record, session_key)
+            
+            return _reject_answer(user_id, giveaway_id, max_attempts - attempts)
+        
+        # Find the active captcha session together with the user's captcha
+        # record, in one round trip
+        row = db.session.execute(_ACTIVE_SESSION, {'user_id': user_id, 'giveaway_id': giveaway_id}).first()
         
-        if not captcha_session:
+        if row is None:
             return jsonify({
                 'success': False,
                 'error': 'No active captcha session found',
                 'error_code': 'CAPTCHA_SESSION_NOT_FOUND'
             }), 404
         
+        captcha_session, captcha_record = row
+        
         # Check if session is expired
         if captcha_session.is_expired():
             return jsonify({
@@ -59,137 +262,11 @@ def validate_captcha():
         # Increment attempts
         captcha_session.increment_attempts()
         
-        # Validate answer
-        is_correct = captcha_generator.validate_answer(str(answer), captcha_session.correct_answer)
-        
-        if is_correct:
-            # Mark session as completed
+        if captcha_generator.validate_answer(str(answer), captcha_session.correct_answer):
             captcha_session.mark_completed()
-            
-            # Update or create user captcha record
-            captcha_record = UserCaptchaRecord.query.filter_by(user_id=user_id).first()
-            if captcha_record:
-                if not captcha_record.captcha_completed:
-                    captcha_record.captcha_completed = True
-                    captcha_record.captcha_completed_at = datetime.utcnow()
-            else:
-                captcha_record = UserCaptchaRecord(
-                    user_id=user_id,
-                    captcha_completed=True,
-                    captcha_completed_at=datetime.utcnow(),
-                    total_participations=0
-                )
-                db.session.add(captcha_record)
-            
-            db.session.commit()
-            
-            # Now proceed with participation registration
-            # This is similar to the registration logic but without captcha check
-            from services.telegive_service import telegive_service
-            from utils.subscription_checker import subscription_checker
-            
-            # Verify subscription
-            giveaway = telegive_service.get_giveaway(giveaway_id)
-            if not giveaway:
-                return jsonify({
-                    'success': False,
-                    'error': 'Giveaway not found',
-                    'error_code': 'GIVEAWAY_NOT_FOUND'
-                }), 404
-            
-            account_id = giveaway.get('account_id')
-            subscription_result = subscription_checker.verify_subscription(user_id, account_id)
-            
-            if not subscription_result.get('success'):
-                return jsonify({
-                    'success': False,
-                    'error': subscription_result.get('error', 'Subscription verification failed'),
-                    'error_code': subscription_result.get('error_code', 'SUBSCRIPTION_ERROR')
-                }), 400
-            
-            if not subscription_result.get('is_subscribed'):
-                return jsonify({
-                    'success': False,
-                    'error': 'User is not subscribed to the required channel',
-                    'error_code': 'USER_NOT_SUBSCRIBED',
-                    'channel_info': subscription_result.get('channel_info')
-                }), 400
-            
-            # Check if user already participated
-            existing_participant = Participant.query.filter_by(
-                giveaway_id=giveaway_id,
-                user_id=user_id
-            ).first()
-            
-            if existing_participant:
-                return jsonify({
-                    'success': True,
-                    'captcha_completed': True,
-                    'participation_confirmed': True,
-                    'participant_id': existing_participant.id,
-                    'note': 'User already participated'
-                })
-            
-            # Create participant record
-            participant = Participant(
-                giveaway_id=giveaway_id,
-                user_id=user_id,
-                captcha_completed=True,
-                subscription_verified=True,
-                subscription_verified_at=datetime.utcnow()
-            )
-            
-            db.session.add(participant)
-            
-            # Update user captcha record participation count
-            captcha_record.total_participations += 1
-            captcha_record.last_participation_at = datetime.utcnow()
-            
-            db.session.commit()
-            
-            return jsonify({
-                'success': True,
-                'captcha_completed': True,
-                'participation_confirmed': True,
-                'participant_id': participant.id
-            })
+            return _confirm_participation(user_id, giveaway_id, captcha_record)
         
-        else:
-            # Wrong answer
-            db.session.commit()
-            
-            attempts_remaining = captcha_session.max_attempts - captcha_session.attempts
-            
-            if attempts_remaining <= 0:
-                # Generate new question after max attempts
-                new_captcha_data = captcha_generator.generate_captcha_data()
-                
-                # Create new session
-                new_session = CaptchaSession.create_session(
-                    user_id=user_id,
-                    giveaway_id=giveaway_id,
-                    question=new_captcha_data['question'],
-                    correct_answer=new_captcha_data['correct_answer'],
-                    timeout_minutes=new_captcha_data['timeout_minutes']
-                )
-                
-                db.session.add(new_session)
-                db.session.commit()
-                
-                return jsonify({
-                    'success': False,
-                    'captcha_completed': False,
-                    'error': 'Maximum attempts exceeded. New question generated.',
-                    'attempts_remaining': new_captcha_data['max_attempts'],
-                    'new_question': new_captcha_data['question']
-                })
-            else:
-                return jsonify({
-                    'success': False,
-                    'captcha_completed': False,
-                    'error': 'Incorrect answer',
-                    'attempts_remaining': attempts_remaining
-                })
+        return _reject_answer(user_id, giveaway_id, captcha_session.max_attempts - captcha_session.attempts)
         
     except Exception as e:
         db.session.rollback()
@@ -199,48 +276,6 @@ def validate_captcha():
             'error_code': 'CAPTCHA_VALIDATION_ERROR'
         }), 500
 
-@captcha_bp.route('/api/participants/captcha-status/<int:user_id>', methods=['GET'])
-def get_captcha_status(user_id):
-    """Check if user has completed captcha globally"""
-    try:
-        # Validate user_id
-        user_validation = input_validator.validate_user_id(user_id)
-        if not user_validation['valid']:
-            return jsonify({
-                'success': False,
-                'error': user_validation['error'],
-                'error_code': user_validation['error_code']
-            }), 400
-        
-        user_id = user_validation['value']
-        
-        # Get user captcha record
-        captcha_record = UserCaptchaRecord.query.filter_by(user_id=user_id).first()
-        
-        if not captcha_record:
-            return jsonify({
-                'success': True,
-                'captcha_completed': False,
-                'completed_at': None,
-                'total_participations': 0,
-                'total_wins': 0
-            })
-        
-        return jsonify({
-            'success': True,
-            'captcha_completed': captcha_record.captcha_completed,
-            'completed_at': captcha_record.captcha_completed_at.isoformat() if captcha_record.captcha_completed_at else None,
-            'total_participations': captcha_record.total_participations,
-            'total_wins': captcha_record.total_wins
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': f'Failed to get captcha status: {str(e)}',
-            'error_code': 'CAPTCHA_STATUS_ERROR'
-        }), 500
-
 @captcha_bp.route('/api/participants/generate-captcha', methods=['POST'])
 def generate_captcha():
     """Generate a new captcha question for a user"""
@@ -270,9 +305,9 @@ def generate_captcha():
         user_id = user_validation['value']
         giveaway_id = giveaway_validation['value']
         
-        # Check if user already has captcha completed globally
-        captcha_record = UserCaptchaRecord.query.filter_by(user_id=user_id).first()
-        if captcha_record and captcha_record.captcha_completed:
+        # Check if user already has captcha completed globally; served from
+        # the Redis status cache, so completed users never reach Postgres
+        if UserCaptchaRecord.cached_status(user_id)['captcha_completed']:
             return jsonify({
                 'success': False,
                 'error': 'User has already completed captcha globally',
@@ -283,23 +318,15 @@ def generate_captcha():
         captcha_data = captcha_generator.generate_captcha_data()
         
         # Create captcha session
-        captcha_session = CaptchaSession.create_session(
-            user_id=user_id,
-            giveaway_id=giveaway_id,
-            question=captcha_data['question'],
-            correct_answer=captcha_data['correct_answer'],
-            timeout_minutes=captcha_data['timeout_minutes']
-        )
-        
-        db.session.add(captcha_session)
+        session_id, expires_at = _start_session(user_id, giveaway_id, captcha_data)
         db.session.commit()
         
         return jsonify({
             'success': True,
             'captcha_question': captcha_data['question'],
-            'captcha_session_id': f"sess_{captcha_session.id}",
+            'captcha_session_id': session_id,
             'attempts_remaining': captcha_data['max_attempts'],
-            'expires_at': captcha_session.expires_at.isoformat()
+            'expires_at': expires_at
         })
         
     except Exception as e:
@@ -312,19 +339,15 @@ def generate_captcha():
 
 @captcha_bp.route('/api/participants/captcha-sessions/cleanup', methods=['POST'])
 def cleanup_expired_sessions():
-    """Cleanup expired captcha sessions"""
+    """Cleanup expired captcha sessions now.
+
+    The background scheduler (tasks/scheduler.py) does this every
+    CLEANUP_INTERVAL_SECONDS; this endpoint is a manual trigger.
+    """
     try:
-        # Delete expired sessions
-        expired_sessions = CaptchaSession.query.filter(
-            CaptchaSession.expires_at < datetime.utcnow()
-        ).all()
-        
-        count = len(expired_sessions)
-        
-        for session in expired_sessions:
-            db.session.delete(session)
-        
-        db.session.commit()
+        count = cleanup_tasks.delete_expired_captcha_sessions(
+            batch_size=current_app.config['CLEANUP_BATCH_SIZE']
+        )
         
         return jsonify({
             'success': True,
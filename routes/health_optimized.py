@@ -1,37 +1,49 @@
 from flask import Blueprint, jsonify
-from datetime import datetime
+from datetime import datetime, timezone
+from sqlalchemy import text
+from models import db, Participant
+from services.health_probe import probe_external_services, external_status
 import logging
+import random
+import secrets
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
 health_optimized_bp = Blueprint('health_optimized', __name__)
 
+# Healthy /health results are reused for this many seconds, so a burst of
+# probes from orchestrators and load balancers costs one evaluation.
+# Unhealthy results are never cached and the next probe re-evaluates.
+HEALTH_CACHE_TTL = 5
+_health_cache = {'at': None, 'result': None}
+_health_lock = threading.Lock()
+
 @health_optimized_bp.route('/health/live', methods=['GET'])
 def liveness_check():
     """Ultra-fast liveness check - no database, no external calls"""
     return jsonify({
         'status': 'alive',
         'service': 'participant-service',
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': datetime.now(timezone.utc)
     }), 200
 
 @health_optimized_bp.route('/health/ready', methods=['GET'])
 def readiness_check():
     """Fast readiness check - minimal database test only"""
     try:
-        # Import only when needed to avoid startup delays
-        from models import db
-        from sqlalchemy import text
-        
-        # Single quick query with timeout
-        result = db.session.execute(text('SELECT 1'))
-        result.close()
+        # Borrow a pooled connection just for the ping, rather than holding
+        # one in the request's session until teardown
+        with db.engine.connect() as connection:
+            connection.exec_driver_sql('SELECT 1')
         
         return jsonify({
             'status': 'ready',
             'service': 'participant-service',
             'database': 'connected',
-            'timestamp': datetime.utcnow().isoformat()
+            'pool': db.engine.pool.status(),
+            'timestamp': datetime.now(timezone.utc)
         }), 200
         
     except Exception as e:
@@ -41,25 +53,35 @@ def readiness_check():
             'service': 'participant-service',
             'database': 'disconnected',
             'error': str(e),
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': datetime.now(timezone.utc)
         }), 503
 
 @health_optimized_bp.route('/health', methods=['GET'])
 def health_check():
     """Fast health check - database only, no external services"""
+    # Concurrent probes wait on the lock and share one evaluation
+    with _health_lock:
+        fetched_at = _health_cache['at']
+        if fetched_at is None or time.monotonic() - fetched_at >= HEALTH_CACHE_TTL:
+            payload, status_code = _compute_health()
+            if status_code != 200:
+                _health_cache['at'] = None
+                return jsonify(payload), status_code
+            _health_cache['result'] = payload
+            _health_cache['at'] = time.monotonic()
+        return jsonify(_health_cache['result']), 200
+
+def _compute_health():
     try:
         health_status = {
             'service': 'participant-service',
             'status': 'healthy',
             'version': '1.0.0',
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': datetime.now(timezone.utc)
         }
         
         # Quick database test only
         try:
-            from models import db
-            from sqlalchemy import text
-            
             result = db.session.execute(text('SELECT 1'))
             result.close()
             health_status['database'] = 'connected'
@@ -68,27 +90,34 @@ def health_check():
             health_status['status'] = 'unhealthy'
             health_status['error'] = str(e)
         
-        # Quick participant count (cached if possible)
+        # Participant count: the planner's estimate on PostgreSQL (a catalog
+        # lookup instead of a full COUNT(*) scan), exact elsewhere
         try:
-            from models import Participant
-            count = Participant.query.count()
+            if db.engine.dialect.name == 'postgresql':
+                count = db.session.execute(
+                    text("SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+                    {'table': Participant.__tablename__}
+                ).scalar()
+                health_status['participants_count_estimated'] = True
+            else:
+                count = Participant.query.count()
             health_status['participants_count'] = count
         except Exception as e:
             health_status['participants_count'] = 'error'
             logger.warning(f"Could not get participant count: {e}")
         
         status_code = 200 if health_status['status'] == 'healthy' else 503
-        return jsonify(health_status), status_code
+        return health_status, status_code
         
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return jsonify({
+        return {
             'service': 'participant-service',
             'status': 'unhealthy',
             'version': '1.0.0',
             'error': str(e),
-            'timestamp': datetime.utcnow().isoformat()
-        }), 503
+            'timestamp': datetime.now(timezone.utc)
+        }, 503
 
 @health_optimized_bp.route('/health/system', methods=['GET'])
 def system_health_check():
@@ -98,13 +127,12 @@ def system_health_check():
             'service': 'participant-service',
             'status': 'healthy',
             'version': '1.0.0',
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': datetime.now(timezone.utc),
             'system_checks': {}
         }
         
         # Test captcha generator
         try:
-            import random
             # Use simple fallback instead of complex captcha generator
             a = random.randint(1, 10)
             b = random.randint(1, 10)
@@ -121,7 +149,6 @@ def system_health_check():
         
         # Test winner selection
         try:
-            import secrets
             # Simple cryptographic selection test
             test_participants = [1, 2, 3, 4, 5]
             selected_count = 2
@@ -165,66 +192,25 @@ def system_health_check():
             'status': 'unhealthy',
             'version': '1.0.0',
             'error': str(e),
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': datetime.now(timezone.utc)
         }), 503
 
 @health_optimized_bp.route('/health/external', methods=['GET'])
 def external_services_health():
     """External services health check - USE ONLY WHEN NEEDED"""
     try:
-        import requests
-        from concurrent.futures import ThreadPoolExecutor, as_completed
-        
+        # Parallel probes over pooled keep-alive connections, shared with
+        # /admin/stats and cached for a few seconds
+        external_services = probe_external_services()
         health_status = {
             'service': 'participant-service',
-            'status': 'healthy',
+            'status': external_status(external_services),
             'version': '1.0.0',
-            'timestamp': datetime.utcnow().isoformat(),
-            'external_services': {}
-        }
-        
-        # External services to check
-        services = {
-            'auth_service': 'https://web-production-ddd7e.up.railway.app',
-            'channel_service': 'https://telegive-channel-production.up.railway.app',
-            'telegive_service': 'https://telegive-giveaway-production.up.railway.app'
+            'timestamp': datetime.now(timezone.utc),
+            'external_services': external_services
         }
         
-        def check_service(service_name, service_url):
-            try:
-                # Very short timeout for external checks
-                response = requests.get(f'{service_url}/health', timeout=1)
-                return service_name, {
-                    'url': service_url,
-                    'status_code': response.status_code,
-                    'accessible': response.status_code == 200,
-                    'response_time': response.elapsed.total_seconds()
-                }
-            except Exception as e:
-                return service_name, {
-                    'url': service_url,
-                    'accessible': False,
-                    'error': str(e)
-                }
-        
-        # Check services in parallel with very short timeout
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            future_to_service = {
-                executor.submit(check_service, name, url): name 
-                for name, url in services.items()
-            }
-            
-            for future in as_completed(future_to_service, timeout=2):
-                try:
-                    service_name, result = future.result()
-                    health_status['external_services'][service_name] = result
-                except Exception as e:
-                    service_name = future_to_service[future]
-                    health_status['external_services'][service_name] = {
-                        'accessible': False,
-                        'error': f'Timeout or error: {str(e)}'
-                    }
-        
+        # Degraded still answers 200 so a slow dependency never fails a probe
         return jsonify(health_status), 200
         
     except Exception as e:
@@ -234,6 +220,6 @@ def external_services_health():
             'status': 'error',
             'version': '1.0.0',
             'error': str(e),
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': datetime.now(timezone.utc)
         }), 503
 
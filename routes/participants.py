@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
-from datetime import datetime
+import orjson
+from datetime import datetime, timezone
 from models import db, Participant, UserCaptchaRecord, WinnerSelectionLog
 from services.telegive_service import telegive_service
 from utils.captcha_generator import captcha_generator
@@ -113,7 +114,7 @@ def register_participation():
             last_name=validated_data.get('last_name'),
             captcha_completed=True,
             subscription_verified=True,
-            subscription_verified_at=datetime.utcnow()
+            subscription_verified_at=datetime.now(timezone.utc)
         )
         
         db.session.add(participant)
@@ -121,12 +122,12 @@ def register_participation():
         # Update user captcha record
         if captcha_record:
             captcha_record.total_participations += 1
-            captcha_record.last_participation_at = datetime.utcnow()
+            captcha_record.last_participation_at = datetime.now(timezone.utc)
         else:
             captcha_record = UserCaptchaRecord(
                 user_id=user_id,
                 captcha_completed=True,
-                captcha_completed_at=datetime.utcnow(),
+                captcha_completed_at=datetime.now(timezone.utc),
                 total_participations=1
             )
             db.session.add(captcha_record)
@@ -168,7 +169,7 @@ def get_participant_list(giveaway_id):
         participants_query = Participant.query.filter_by(giveaway_id=giveaway_id)
         total = participants_query.count()
         
-        participants = participants_query.offset((page - 1) * limit).limit(limit).all()
+        participants_json = Participant.page_as_json(giveaway_id, limit, (page - 1) * limit)
         
         # Calculate statistics
         stats = {
@@ -180,7 +181,7 @@ def get_participant_list(giveaway_id):
         
         return jsonify({
             'success': True,
-            'participants': [p.to_dict() for p in participants],
+            'participants': orjson.Fragment(participants_json),
             'stats': stats,
             'pagination': {
                 'page': page,
@@ -253,7 +254,7 @@ def select_winners(giveaway_id):
         for user_id in selected_user_ids:
             participant = next(p for p in eligible_participants if p.user_id == user_id)
             participant.is_winner = True
-            participant.winner_selected_at = datetime.utcnow()
+            participant.winner_selected_at = datetime.now(timezone.utc)
             
             winners.append({
                 'user_id': participant.user_id,
@@ -344,7 +345,7 @@ def get_user_history(user_id):
             participations_data.append({
                 'giveaway_id': participation.giveaway_id,
                 'giveaway_title': giveaway.get('title', 'Unknown Giveaway') if giveaway else 'Unknown Giveaway',
-                'participated_at': participation.participated_at.isoformat() if participation.participated_at else None,
+                'participated_at': participation.participated_at,
                 'is_winner': participation.is_winner,
                 'giveaway_status': giveaway.get('status', 'unknown') if giveaway else 'unknown'
             })
@@ -391,7 +392,7 @@ def verify_subscription():
         result = subscription_checker.verify_subscription(user_validation['value'], account_id)
         
         if result.get('success'):
-            result['verified_at'] = datetime.utcnow().isoformat()
+            result['verified_at'] = datetime.now(timezone.utc)
         
         return jsonify(result)
         
@@ -424,9 +425,9 @@ def update_delivery_status():
             try:
                 delivery_timestamp = datetime.fromisoformat(delivery_timestamp.replace('Z', '+00:00'))
             except ValueError:
-                delivery_timestamp = datetime.utcnow()
+                delivery_timestamp = datetime.now(timezone.utc)
         else:
-            delivery_timestamp = datetime.utcnow()
+            delivery_timestamp = datetime.now(timezone.utc)
         
         # Update participants
         updated_count = 0
@@ -1,9 +1,11 @@
 from flask import Blueprint, request, jsonify, current_app
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import random
 import secrets
 import logging
 import requests
 import os
+from utils.captcha_generator import captcha_generator
 
 logger = logging.getLogger(__name__)
 
@@ -13,123 +15,6 @@ def log_api_call(endpoint, user_id=None, giveaway_id=None, success=True, error=N
     """Log all API calls for debugging and analytics"""
     logger.info(f"API: {endpoint} | User: {user_id} | Giveaway: {giveaway_id} | Success: {success} | Error: {error}")
 
-@bot_service_bp.route('/api/participants/captcha-status/<int:user_id>', methods=['GET'])
-def get_captcha_status(user_id):
-    """
-    Check if user has completed captcha globally
-    Used by Bot Service to optimize participation flow
-    """
-    try:
-        # Import models within app context to avoid SQLAlchemy issues
-        with current_app.app_context():
-            from models import db, UserCaptchaRecord
-            
-            captcha_record = UserCaptchaRecord.query.filter_by(user_id=user_id).first()
-            
-            if captcha_record:
-                log_api_call('/api/participants/captcha-status', user_id, None, True, 'STATUS_FOUND')
-                return jsonify({
-                    'success': True,
-                    'captcha_completed': captcha_record.captcha_completed,
-                    'completed_at': captcha_record.captcha_completed_at.isoformat() if captcha_record.captcha_completed_at else None,
-                    'total_participations': captcha_record.total_participations,
-                    'total_wins': captcha_record.total_wins,
-                    'first_participation': captcha_record.first_participation_at.isoformat() if captcha_record.first_participation_at else None
-                }), 200
-            else:
-                # New user
-                log_api_call('/api/participants/captcha-status', user_id, None, True, 'NEW_USER')
-                return jsonify({
-                    'success': True,
-                    'captcha_completed': False,
-                    'total_participations': 0,
-                    'total_wins': 0
-                }), 200
-                
-    except Exception as e:
-        log_api_call('/api/participants/captcha-status', user_id, None, False, str(e))
-        return jsonify({
-            'success': False,
-            'error': f'Failed to get captcha status: {str(e)}',
-            'error_code': 'CAPTCHA_STATUS_ERROR'
-        }), 500
-
-@bot_service_bp.route('/api/participants/winner-status/<int:user_id>/<int:giveaway_id>', methods=['GET'])
-def get_winner_status(user_id, giveaway_id):
-    """
-    Check if user won the giveaway
-    Used for VIEW RESULTS functionality
-    """
-    try:
-        with current_app.app_context():
-            from models import db, Participant
-            
-            # Check if user participated
-            participation = Participant.query.filter_by(
-                giveaway_id=giveaway_id, 
-                user_id=user_id
-            ).first()
-            
-            if not participation:
-                log_api_call('/api/participants/winner-status', user_id, giveaway_id, True, 'USER_NOT_PARTICIPATED')
-                return jsonify({
-                    'success': True,
-                    'participated': False,
-                    'is_winner': False,
-                    'message': 'User did not participate in this giveaway'
-                }), 200
-            
-            # Get total winner count
-            total_winners = Participant.query.filter_by(
-                giveaway_id=giveaway_id, 
-                is_winner=True
-            ).count()
-            
-            log_api_call('/api/participants/winner-status', user_id, giveaway_id, True, f'WINNER_STATUS_{participation.is_winner}')
-            return jsonify({
-                'success': True,
-                'participated': True,
-                'is_winner': participation.is_winner,
-                'winner_selected_at': participation.winner_selected_at.isoformat() if participation.winner_selected_at else None,
-                'total_winners': total_winners,
-                'participant_id': participation.id
-            }), 200
-            
-    except Exception as e:
-        log_api_call('/api/participants/winner-status', user_id, giveaway_id, False, str(e))
-        return jsonify({
-            'success': False,
-            'error': f'Failed to get winner status: {str(e)}',
-            'error_code': 'WINNER_STATUS_ERROR'
-        }), 500
-
-@bot_service_bp.route('/api/participants/count/<int:giveaway_id>', methods=['GET'])
-def get_participant_count(giveaway_id):
-    """
-    Get participant count for giveaway
-    Used for real-time participant counter
-    """
-    try:
-        with current_app.app_context():
-            from models import db, Participant
-            
-            count = Participant.query.filter_by(giveaway_id=giveaway_id).count()
-            
-            log_api_call('/api/participants/count', None, giveaway_id, True, f'COUNT_{count}')
-            return jsonify({
-                'success': True,
-                'giveaway_id': giveaway_id,
-                'count': count
-            }), 200
-            
-    except Exception as e:
-        log_api_call('/api/participants/count', None, giveaway_id, False, str(e))
-        return jsonify({
-            'success': False,
-            'error': f'Failed to get participant count: {str(e)}',
-            'error_code': 'PARTICIPANT_COUNT_ERROR'
-        }), 500
-
 @bot_service_bp.route('/api/participants/register-enhanced', methods=['POST'])
 def register_participant_enhanced():
     """
@@ -179,11 +64,9 @@ def register_participant_enhanced():
             if not captcha_record or not captcha_record.captcha_completed:
                 # New user - generate captcha
                 try:
-                    from utils.captcha_generator import captcha_generator
                     question, answer = captcha_generator.generate_question()
                 except:
                     # Fallback captcha generation
-                    import random
                     a = random.randint(1, 10)
                     b = random.randint(1, 10)
                     question = f"What is {a} + {b}?"
@@ -191,7 +74,7 @@ def register_participant_enhanced():
                 
                 # Create captcha session
                 session_id = secrets.token_urlsafe(16)
-                expires_at = datetime.utcnow() + timedelta(minutes=10)
+                expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)
                 
                 captcha_session = CaptchaSession(
                     user_id=user_id,
@@ -296,7 +179,7 @@ def validate_captcha_enhanced():
                 }), 404
             
             # Check if session expired
-            if datetime.utcnow() > captcha_session.expires_at:
+            if captcha_session.is_expired():
                 db.session.delete(captcha_session)
                 db.session.commit()
                 log_api_call('/api/participants/validate-captcha-enhanced', user_id, giveaway_id, False, 'CAPTCHA_EXPIRED')
@@ -307,20 +190,20 @@ def validate_captcha_enhanced():
                 }), 410
             
             # Validate answer
-            if user_answer == captcha_session.correct_answer:
+            if captcha_generator.validate_answer(user_answer, captcha_session.correct_answer):
                 # Correct answer - complete captcha globally
                 captcha_record = UserCaptchaRecord.query.filter_by(user_id=user_id).first()
                 
                 if captcha_record:
                     captcha_record.captcha_completed = True
-                    captcha_record.captcha_completed_at = datetime.utcnow()
+                    captcha_record.captcha_completed_at = datetime.now(timezone.utc)
                     captcha_record.total_participations += 1
                 else:
                     captcha_record = UserCaptchaRecord(
                         user_id=user_id,
                         captcha_completed=True,
-                        captcha_completed_at=datetime.utcnow(),
-                        first_participation_at=datetime.utcnow(),
+                        captcha_completed_at=datetime.now(timezone.utc),
+                        first_participation_at=datetime.now(timezone.utc),
                         total_participations=1,
                         total_wins=0
                     )
@@ -359,11 +242,9 @@ def validate_captcha_enhanced():
                 if captcha_session.attempts >= captcha_session.max_attempts:
                     # Generate new question after max attempts
                     try:
-                        from utils.captcha_generator import captcha_generator
                         question, answer = captcha_generator.generate_question()
                     except:
                         # Fallback captcha generation
-                        import random
                         a = random.randint(1, 10)
                         b = random.randint(1, 10)
                         question = f"What is {a} + {b}?"
@@ -372,7 +253,7 @@ def validate_captcha_enhanced():
                     captcha_session.question = question
                     captcha_session.correct_answer = answer
                     captcha_session.attempts = 0
-                    captcha_session.expires_at = datetime.utcnow() + timedelta(minutes=10)
+                    captcha_session.expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)
                     
                     db.session.commit()
                     
@@ -406,4 +287,3 @@ def validate_captcha_enhanced():
             'error': f'Captcha validation failed: {str(e)}',
             'error_code': 'CAPTCHA_VALIDATION_ERROR'
         }), 500
-
@@ -0,0 +1,115 @@
+import threading
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+
+# Shared across requests: keep-alive connections to the upstream services
+# and a long-lived pool for the parallel /health probes
+_probe_session = requests.Session()
+_probe_session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=0))
+_probe_session.mount('http://', HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=0))
+_probe_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix='health-probe')
+
+EXTERNAL_SERVICES = {
+    'auth_service': 'https://web-production-ddd7e.up.railway.app',
+    'channel_service': 'https://telegive-channel-production.up.railway.app',
+    'telegive_service': 'https://telegive-giveaway-production.up.railway.app'
+}
+
+# (connect, read) seconds per probe; a slow dependency must not hold up
+# liveness checks, so this stays well inside the 2s wait in _probe_all
+PROBE_TIMEOUT = (0.5, 1.0)
+
+# Probe results are shared by every caller within this many seconds
+PROBE_CACHE_TTL = 5
+_probe_cache = {'at': None, 'results': None}
+_probe_lock = threading.Lock()
+
+# Per-service circuit breaker: after BREAKER_FAIL_MAX consecutive failed
+# probes the service is reported down without a request for BREAKER_COOLDOWN s
+BREAKER_FAIL_MAX = 3
+BREAKER_COOLDOWN = 30
+_breakers = {name: {'fails': 0, 'open_until': 0.0} for name in EXTERNAL_SERVICES}
+_breaker_lock = threading.Lock()
+
+def _check_service(service_name, service_url):
+    """Probe one service's /health endpoint with a very short timeout"""
+    breaker = _breakers[service_name]
+    if time.monotonic() < breaker['open_until']:
+        return service_name, {
+            'url': service_url,
+            'accessible': False,
+            'circuit': 'open'
+        }
+    
+    try:
+        # HEAD skips the body; fall back to GET for servers that reject it
+        url = f'{service_url}/health'
+        response = _probe_session.head(url, timeout=PROBE_TIMEOUT, allow_redirects=False)
+        if response.status_code == 405:
+            response = _probe_session.get(url, timeout=PROBE_TIMEOUT)
+        with _breaker_lock:
+            breaker['fails'] = 0
+        return service_name, {
+            'url': service_url,
+            'status_code': response.status_code,
+            'accessible': response.status_code == 200,
+            'response_time': response.elapsed.total_seconds()
+        }
+    except Exception as e:
+        with _breaker_lock:
+            breaker['fails'] += 1
+            if breaker['fails'] >= BREAKER_FAIL_MAX:
+                # Stays at the threshold so a failed trial probe reopens it
+                breaker['open_until'] = time.monotonic() + BREAKER_COOLDOWN
+        return service_name, {
+            'url': service_url,
+            'accessible': False,
+            'error': str(e)
+        }
+
+def _probe_all():
+    """Probe every external service in parallel, waiting at most 2s"""
+    results = {}
+    future_to_service = {
+        _probe_pool.submit(_check_service, name, url): name
+        for name, url in EXTERNAL_SERVICES.items()
+    }
+    
+    try:
+        for future in as_completed(future_to_service, timeout=2):
+            service_name, result = future.result()
+            results[service_name] = result
+    except Exception as e:
+        for service_name in future_to_service.values():
+            results.setdefault(service_name, {
+                'url': EXTERNAL_SERVICES[service_name],
+                'accessible': False,
+                'error': f'Timeout: {str(e)}'
+            })
+    
+    return results
+
+def external_status(results):
+    """'healthy' when every probed service answered, else 'degraded'.
+
+    External outages never make this service unhealthy; only its own
+    database does.
+    """
+    if all(result.get('accessible') for result in results.values()):
+        return 'healthy'
+    return 'degraded'
+
+def probe_external_services():
+    """Probe results, recomputed at most once per PROBE_CACHE_TTL seconds.
+
+    The lock is held while probing so concurrent callers wait for and share
+    a single round of probes instead of each starting their own.
+    """
+    with _probe_lock:
+        fetched_at = _probe_cache['at']
+        if fetched_at is None or time.monotonic() - fetched_at >= PROBE_CACHE_TTL:
+            _probe_cache['results'] = _probe_all()
+            _probe_cache['at'] = time.monotonic()
+        return _probe_cache['results']
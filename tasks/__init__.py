@@ -1,9 +1,11 @@
 from .cleanup_tasks import cleanup_tasks, cleanup_expired_sessions, cleanup_old_sessions, run_cleanup
+from .scheduler import start_scheduler
 
 __all__ = [
     'cleanup_tasks',
     'cleanup_expired_sessions',
     'cleanup_old_sessions',
-    'run_cleanup'
+    'run_cleanup',
+    'start_scheduler'
 ]
 
@@ -1,33 +1,63 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from models import db, CaptchaSession
+from sqlalchemy import bindparam, delete, select, func
 import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = 5000
+
+# One batch of expired sessions; deleting by primary key keeps each
+# statement's locks short on a large table
+_DELETE_EXPIRED_BATCH = delete(CaptchaSession).where(
+    CaptchaSession.id.in_(
+        select(CaptchaSession.id)
+        .where(CaptchaSession.expires_at < bindparam('now'))
+        .limit(bindparam('batch_size'))
+    )
+).execution_options(synchronize_session=False)
+
+# Every gunicorn worker runs the scheduled cleanup; a transaction-scoped
+# advisory lock lets only one of them delete at a time on Postgres
+_CLEANUP_LOCK_ID = 0x63617074
+_TRY_CLEANUP_LOCK = select(func.pg_try_advisory_xact_lock(_CLEANUP_LOCK_ID))
+
 class CleanupTasks:
     """Background tasks for cleaning up expired data"""
     
     def __init__(self):
         pass
     
-    def cleanup_expired_captcha_sessions(self):
+    def delete_expired_captcha_sessions(self, batch_size=DEFAULT_BATCH_SIZE):
+        """Delete expired captcha sessions batch by batch, committing each.
+
+        Returns the number of sessions deleted. Stops early on Postgres when
+        another process holds the cleanup lock.
+        """
+        params = {'now': datetime.now(timezone.utc), 'batch_size': batch_size}
+        check_lock = db.engine.dialect.name == 'postgresql'
+        total = 0
+        
+        while True:
+            if check_lock and not db.session.scalar(_TRY_CLEANUP_LOCK):
+                db.session.rollback()
+                break
+            
+            count = db.session.execute(_DELETE_EXPIRED_BATCH, params).rowcount
+            db.session.commit()
+            total += count
+            
+            if count < batch_size:
+                break
+        
+        return total
+    
+    def cleanup_expired_captcha_sessions(self, batch_size=DEFAULT_BATCH_SIZE):
         """Remove expired captcha sessions from database"""
         try:
-            # Find expired sessions
-            expired_sessions = CaptchaSession.query.filter(
-                CaptchaSession.expires_at < datetime.utcnow()
-            ).all()
-            
-            count = len(expired_sessions)
+            count = self.delete_expired_captcha_sessions(batch_size)
             
             if count > 0:
-                logger.info(f"Cleaning up {count} expired captcha sessions")
-                
-                # Delete expired sessions
-                for session in expired_sessions:
-                    db.session.delete(session)
-                
-                db.session.commit()
                 logger.info(f"Successfully cleaned up {count} expired captcha sessions")
             else:
                 logger.debug("No expired captcha sessions to clean up")
@@ -42,7 +72,7 @@ class CleanupTasks:
     def cleanup_old_captcha_sessions(self, days_old=7):
         """Remove old captcha sessions (completed or not) after specified days"""
         try:
-            cutoff_date = datetime.utcnow() - timedelta(days=days_old)
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_old)
             
             old_sessions = CaptchaSession.query.filter(
                 CaptchaSession.created_at < cutoff_date
@@ -71,27 +101,20 @@ class CleanupTasks:
     def get_cleanup_stats(self):
         """Get statistics about data that can be cleaned up"""
         try:
-            now = datetime.utcnow()
-            
-            # Count expired sessions
-            expired_count = CaptchaSession.query.filter(
-                CaptchaSession.expires_at < now
-            ).count()
+            now = datetime.now(timezone.utc)
             
-            # Count old sessions (7+ days)
             old_cutoff = now - timedelta(days=7)
-            old_count = CaptchaSession.query.filter(
-                CaptchaSession.created_at < old_cutoff
-            ).count()
-            
-            # Count total sessions
-            total_sessions = CaptchaSession.query.count()
-            
-            # Count active sessions
-            active_sessions = CaptchaSession.query.filter(
-                CaptchaSession.expires_at > now,
-                CaptchaSession.completed == False
-            ).count()
+            
+            # All four counts in one Core query; no ORM entities or autoflush
+            stmt = select(
+                func.count(),
+                func.count().filter(CaptchaSession.expires_at > now, CaptchaSession.completed == False),
+                func.count().filter(CaptchaSession.expires_at < now),
+                func.count().filter(CaptchaSession.created_at < old_cutoff)
+            ).select_from(CaptchaSession)
+            
+            with db.session.no_autoflush:
+                total_sessions, active_sessions, expired_count, old_count = db.session.execute(stmt).one()
             
             return {
                 'total_captcha_sessions': total_sessions,
@@ -0,0 +1,45 @@
+import atexit
+import logging
+from apscheduler.schedulers.background import BackgroundScheduler
+from .cleanup_tasks import cleanup_tasks
+
+logger = logging.getLogger(__name__)
+
+_scheduler = None
+
+def _cleanup_expired(app):
+    with app.app_context():
+        cleanup_tasks.cleanup_expired_captcha_sessions(app.config['CLEANUP_BATCH_SIZE'])
+
+def _shutdown(scheduler):
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+
+def start_scheduler(app):
+    """Run periodic cleanup in a background thread of this process.
+
+    Call once per serving process (gunicorn post_fork, or before app.run);
+    threads started before a fork do not survive into the workers.
+    CLEANUP_INTERVAL_SECONDS = 0 disables it.
+    """
+    global _scheduler
+    interval = app.config.get('CLEANUP_INTERVAL_SECONDS', 0)
+    if _scheduler is not None or interval <= 0:
+        return _scheduler
+    
+    scheduler = BackgroundScheduler(daemon=True)
+    scheduler.add_job(
+        _cleanup_expired,
+        'interval',
+        args=[app],
+        seconds=interval,
+        id='cleanup_expired_captcha_sessions',
+        max_instances=1,
+        coalesce=True
+    )
+    scheduler.start()
+    atexit.register(_shutdown, scheduler)
+    
+    _scheduler = scheduler
+    logger.info("Captcha session cleanup scheduled every %ss", interval)
+    return scheduler
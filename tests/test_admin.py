@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import text
+
+from app import create_app
+from models import db, Participant
+from config import TestingConfig
+from routes import admin_optimized
+
+class TestAdminDbStatus:
+
+    @pytest.fixture
+    def app(self, monkeypatch):
+        """Create test application; the Postgres catalog query becomes a live count"""
+        monkeypatch.setattr(admin_optimized, '_PARTICIPANTS_TABLE_INFO', text(
+            'SELECT 1 AS "exists", (SELECT count(*) FROM participants) AS estimate'
+        ))
+        admin_optimized._database_status_payload.cache_clear()
+        
+        app = create_app('testing')
+        app.config.from_object(TestingConfig)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        with app.app_context():
+            db.create_all()
+        yield app
+        with app.app_context():
+            db.drop_all()
+        admin_optimized._database_status_payload.cache_clear()
+    
+    def _record_counts(self, app):
+        client = app.test_client()
+        counts = [client.get('/admin/db-status').get_json()['tables']['participants']['record_count']]
+        with app.app_context():
+            db.session.add(Participant(giveaway_id=1, user_id=1))
+            db.session.commit()
+        counts.append(client.get('/admin/db-status').get_json()['tables']['participants']['record_count'])
+        return counts
+    
+    def test_db_status_cache_disabled(self, app):
+        """DB_STATUS_CACHE_TTL = 0 recomputes on every request"""
+        app.config['DB_STATUS_CACHE_TTL'] = 0
+        
+        assert self._record_counts(app) == [0, 1]
+    
+    def test_db_status_cache_ttl_from_config(self, app):
+        """A positive DB_STATUS_CACHE_TTL reuses the result within the window"""
+        app.config['DB_STATUS_CACHE_TTL'] = 3600
+        
+        assert self._record_counts(app) == [0, 0]
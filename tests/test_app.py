@@ -0,0 +1,77 @@
+import importlib
+import logging
+import os
+
+import pytest
+
+import app as app_module
+from config import ProductionConfig, settings
+from config.settings import DEFAULT_SECRET_KEY
+
+class TestQueueLogging:
+
+    @pytest.fixture
+    def log_file(self, tmp_path):
+        """Root logger writing only to a file through the queue listener"""
+        root = logging.getLogger()
+        saved_handlers, saved_level = root.handlers[:], root.level
+        path = tmp_path / 'app.log'
+        
+        root.handlers = [logging.FileHandler(path)]
+        root.setLevel(logging.INFO)
+        app_module._enable_queue_logging()
+        yield path
+        
+        handlers = app_module._log_listener.handlers
+        app_module._stop_queue_logging()
+        for handler in handlers:
+            handler.close()
+        root.handlers = saved_handlers
+        root.setLevel(saved_level)
+    
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork()')
+    def test_forked_child_records_are_written(self, log_file):
+        """A child that restarts the listener gets its records written"""
+        pid = os.fork()
+        if pid == 0:
+            try:
+                app_module.restart_queue_logging()
+                logging.getLogger('worker').warning('from the forked child')
+                app_module._stop_queue_logging()
+            finally:
+                os._exit(0)
+        
+        os.waitpid(pid, 0)
+        
+        assert 'from the forked child' in log_file.read_text()
+
+class TestProductionConfig:
+    
+    def test_default_secret_key_refuses_to_start(self, monkeypatch):
+        """Production will not sign captcha tokens with the development key"""
+        monkeypatch.setattr(ProductionConfig, 'SECRET_KEY', DEFAULT_SECRET_KEY)
+        
+        with pytest.raises(RuntimeError, match='SECRET_KEY'):
+            app_module.create_app('production')
+
+class TestDatabaseConfig:
+    
+    @pytest.fixture
+    def engine_options(self, monkeypatch):
+        """Engine options the base Config builds for a given DATABASE_URL"""
+        def load(url):
+            monkeypatch.setenv('DATABASE_URL', url)
+            return importlib.reload(settings).Config.SQLALCHEMY_ENGINE_OPTIONS
+        yield load
+        monkeypatch.undo()
+        importlib.reload(settings)
+    
+    def test_postgresql_gets_tcp_keepalives(self, engine_options):
+        """libpq keepalives are passed for a PostgreSQL URL"""
+        options = engine_options('postgresql+psycopg2://localhost/telegive_participant')
+        
+        assert options['connect_args']['keepalives'] == 1
+    
+    def test_other_backends_get_no_libpq_arguments(self, engine_options):
+        """A non-PostgreSQL URL gets no libpq-only connect arguments"""
+        assert 'connect_args' not in engine_options('sqlite:///participants.db')
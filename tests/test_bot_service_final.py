@@ -0,0 +1,117 @@
+import pytest
+
+from app import create_app
+from models import db, CaptchaSession, Participant, UserCaptchaRecord
+from config import TestingConfig
+
+class TestBotServiceFinal:
+    
+    @pytest.fixture
+    def app(self):
+        """Create test application"""
+        app = create_app('testing')
+        app.config.from_object(TestingConfig)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        return app
+    
+    @pytest.fixture
+    def client(self, app):
+        """Create test client; requests get their own app context so the
+        query guard only counts the queries they issue"""
+        with app.app_context():
+            db.create_all()
+        yield app.test_client()
+        with app.app_context():
+            db.drop_all()
+    
+    def test_participant_count_query_budget(self, app, client):
+        """The count endpoint stays within two queries (checked by the app's query guard)"""
+        with app.app_context():
+            for user_id in range(1, 4):
+                db.session.add(Participant(giveaway_id=1, user_id=user_id))
+            db.session.commit()
+        
+        app.config['MAX_QUERIES_PER_REQUEST'] = 2
+        response = client.get('/api/v2/participants/count/1')
+        
+        assert response.status_code == 200
+        assert response.get_json()['count'] == 3
+    
+    def test_register_bulk_skips_duplicates_and_unverified_users(self, app, client):
+        """Bulk registration inserts verified users only, once per giveaway"""
+        with app.app_context():
+            for user_id in (1, 2, 3):
+                db.session.add(UserCaptchaRecord(user_id=user_id, captcha_completed=True, total_participations=0))
+            db.session.add(Participant(giveaway_id=1, user_id=3))
+            db.session.commit()
+        
+        response = client.post('/api/v2/participants/register-bulk', json={
+            'giveaway_id': 1,
+            'participants': [{'user_id': 1, 'username': 'one'}, {'user_id': 2}, {'user_id': 3}, {'user_id': 4}]
+        })
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert sorted(data['registered']) == [1, 2]
+        assert data['already_participating'] == [3]
+        assert data['requires_captcha'] == [4]
+        
+        with app.app_context():
+            assert Participant.query.filter_by(giveaway_id=1).count() == 3
+            assert UserCaptchaRecord.query.filter_by(user_id=1).one().total_participations == 1
+    
+    @pytest.mark.parametrize('payload, error_code', [
+        ([{'user_id': 1}], 'INVALID_BATCH'),
+        ({'giveaway_id': 1, 'participants': {'user_id': 1}}, 'INVALID_BATCH'),
+        ({'giveaway_id': '1', 'participants': [{'user_id': 1}]}, 'INVALID_BATCH'),
+        ({'giveaway_id': 1, 'participants': [{'user_id': 1}, 'two']}, 'INVALID_PARTICIPANT'),
+        ({'giveaway_id': 1, 'participants': [{'user_id': '1'}]}, 'INVALID_PARTICIPANT'),
+        ({'giveaway_id': 1, 'participants': [{'user_id': 1, 'username': 5}]}, 'INVALID_PARTICIPANT')
+    ])
+    def test_register_bulk_rejects_malformed_batches(self, app, client, payload, error_code):
+        """Malformed batches get a 400 and nothing is written"""
+        response = client.post('/api/v2/participants/register-bulk', json=payload)
+        
+        assert response.status_code == 400
+        assert response.get_json()['error_code'] == error_code
+        with app.app_context():
+            assert Participant.query.count() == 0
+    
+    def test_register_bulk_rejects_non_json_body(self, client):
+        """A body that is not JSON is a 400, not a 500"""
+        response = client.post('/api/v2/participants/register-bulk', data='nope', content_type='text/plain')
+        
+        assert response.status_code == 400
+        assert response.get_json()['error_code'] == 'INVALID_BATCH'
+    
+    def test_register_then_validate_database_session(self, app, client):
+        """Without Redis the captcha session is a row addressed as sess_<id>"""
+        response = client.post('/api/v2/participants/register', json={'giveaway_id': 1, 'user_id': 5})
+        
+        assert response.status_code == 200
+        session_id = response.get_json()['session_id']
+        with app.app_context():
+            captcha_session = CaptchaSession.query.one()
+            assert session_id == f'sess_{captcha_session.id}'
+            answer = captcha_session.correct_answer
+        
+        response = client.post('/api/v2/participants/validate-captcha', json={
+            'giveaway_id': 1, 'user_id': 5, 'session_id': session_id, 'answer': f' 0{answer}'
+        })
+        
+        assert response.status_code == 200
+        assert response.get_json()['participation_confirmed'] is True
+        with app.app_context():
+            assert CaptchaSession.query.count() == 0
+            assert Participant.query.filter_by(giveaway_id=1, user_id=5).count() == 1
+    
+    def test_participant_count_not_modified(self, client):
+        """A poll repeating the count's ETag gets an empty 304"""
+        first = client.get('/api/v2/participants/count/1')
+        etag = first.headers['ETag']
+        
+        second = client.get('/api/v2/participants/count/1', headers={'If-None-Match': etag})
+        
+        assert second.status_code == 304
+        assert second.data == b''
+        assert second.headers['ETag'] == etag
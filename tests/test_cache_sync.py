@@ -0,0 +1,58 @@
+import pytest
+
+from app import create_app
+from models import db, Participant, UserCaptchaRecord
+from models.user_captcha_record import STATUS_CACHE_TTL
+from config import TestingConfig
+from utils.redis_cache import redis_cache
+
+class TestCacheSync:
+    
+    @pytest.fixture
+    def app(self, monkeypatch):
+        """Create test application, recording the Redis writes the hooks make"""
+        self.deleted, self.bumped = [], []
+        monkeypatch.setattr(redis_cache, 'delete', lambda *keys: self.deleted.extend(keys))
+        monkeypatch.setattr(redis_cache, 'incr_if_exists', self.bumped.append)
+        
+        app = create_app('testing')
+        app.config.from_object(TestingConfig)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        with app.app_context():
+            db.create_all()
+        yield app
+        with app.app_context():
+            db.drop_all()
+    
+    def test_commit_applies_cache_updates(self, app):
+        """A committed registration bumps the count and drops the user's status"""
+        create_app('testing')  # registering again must not double the hooks
+        with app.app_context():
+            db.session.add(Participant(giveaway_id=7, user_id=5))
+            db.session.add(UserCaptchaRecord(user_id=5, captcha_completed=True))
+            db.session.commit()
+        
+        assert self.bumped == [Participant.count_cache_key(7)]
+        assert self.deleted == [UserCaptchaRecord.status_cache_key(5)]
+    
+    def test_rollback_discards_cache_updates(self, app):
+        """Flushed but rolled-back changes leave the cache alone"""
+        with app.app_context():
+            db.session.add(UserCaptchaRecord(user_id=5, captcha_completed=True))
+            db.session.flush()
+            db.session.rollback()
+            db.session.commit()
+        
+        assert self.deleted == [] and self.bumped == []
+    
+    def test_status_fill_is_short_lived(self, app, monkeypatch):
+        """A read-through fill expires quickly, bounding a fill that raced an invalidation"""
+        filled = []
+        monkeypatch.setattr(redis_cache, 'get_json', lambda key: None)
+        monkeypatch.setattr(redis_cache, 'set_json', lambda key, value, ttl: filled.append((key, ttl)))
+        
+        with app.app_context():
+            assert UserCaptchaRecord.cached_status(5)['captcha_completed'] is False
+        
+        assert filled == [(UserCaptchaRecord.status_cache_key(5), STATUS_CACHE_TTL)]
+        assert STATUS_CACHE_TTL <= 60
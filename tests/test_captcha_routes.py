@@ -0,0 +1,195 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import create_app
+from models import db, CaptchaSession, Participant, UserCaptchaRecord
+from config import TestingConfig
+from routes import captcha as captcha_routes
+from utils.redis_cache import redis_cache
+
+class FakeRedisSessions:
+    """In-memory stand-in for the RedisCache calls the captcha routes make"""
+    
+    def __init__(self):
+        self.hashes = {}
+    
+    def set_hash(self, key, mapping, ttl):
+        self.hashes[key] = {field: str(value) for field, value in mapping.items()}
+        return True
+    
+    def incr_hash(self, key, field, fields):
+        values = self.hashes.get(key)
+        if values is None:
+            return None
+        values[field] = str(int(values[field]) + 1)
+        return [values[name] for name in fields]
+    
+    def delete(self, *keys):
+        for key in keys:
+            self.hashes.pop(key, None)
+
+class TestCaptchaRoutes:
+
+    @pytest.fixture
+    def app(self, monkeypatch):
+        """Create test application with the upstream services stubbed"""
+        app = create_app('testing')
+        app.config.from_object(TestingConfig)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        
+        monkeypatch.setattr(captcha_routes.telegive_service, 'get_giveaway', lambda giveaway_id: {'account_id': 1})
+        self.subscribed = True
+        monkeypatch.setattr(
+            captcha_routes.subscription_checker, 'verify_subscription',
+            lambda user_id, account_id: {'success': True, 'is_subscribed': self.subscribed}
+        )
+        return app
+    
+    @pytest.fixture
+    def client(self, app):
+        """Create test client; requests get their own app context so the
+        query guard only counts the queries they issue"""
+        with app.app_context():
+            db.create_all()
+        yield app.test_client()
+        with app.app_context():
+            db.drop_all()
+    
+    @pytest.fixture
+    def fake_redis(self, monkeypatch):
+        """Route captcha sessions through an in-memory Redis hash store"""
+        fake = FakeRedisSessions()
+        for name in ('set_hash', 'incr_hash', 'delete'):
+            monkeypatch.setattr(redis_cache, name, getattr(fake, name))
+        return fake
+    
+    def _generate(self, client):
+        response = client.post('/api/participants/generate-captcha', json={'user_id': 5, 'giveaway_id': 7})
+        assert response.status_code == 200
+        return response.get_json()
+    
+    def _validate(self, client, answer):
+        return client.post('/api/participants/validate-captcha', json={'user_id': 5, 'giveaway_id': 7, 'answer': answer})
+    
+    def test_validate_is_rate_limited(self, app, client, monkeypatch):
+        """Answers past the per-user limit are shed with a 429 before any query"""
+        monkeypatch.setattr(redis_cache, 'allow', lambda key, limit, window: key != 'rl:captcha:5')
+        
+        app.config['MAX_QUERIES_PER_REQUEST'] = 0
+        response = self._validate(client, 1)
+        
+        assert response.status_code == 429
+        assert response.get_json()['error_code'] == 'RATE_LIMITED'
+    
+    def test_generate_then_validate_database_session(self, app, client):
+        """Without Redis the session is a row, validated through the served route"""
+        assert self._generate(client)['captcha_session_id'].startswith('sess_')
+        with app.app_context():
+            correct_answer = CaptchaSession.query.one().correct_answer
+        
+        assert self._validate(client, correct_answer + 1).get_json()['attempts_remaining'] == 2
+        
+        response = self._validate(client, correct_answer)
+        assert response.status_code == 200
+        assert response.get_json()['participation_confirmed'] is True
+        
+        with app.app_context():
+            assert Participant.query.filter_by(giveaway_id=7, user_id=5).count() == 1
+            assert CaptchaSession.query.one().completed is True
+            assert UserCaptchaRecord.query.filter_by(user_id=5).one().total_participations == 1
+    
+    def test_generate_then_validate_redis_session(self, app, client, fake_redis):
+        """With Redis the session is a hash, validated and deleted by the served route"""
+        assert self._generate(client)['captcha_session_id'] == 'cs_5_7'
+        correct_answer = int(fake_redis.hashes['cs:5:7']['answer'])
+        
+        assert self._validate(client, correct_answer + 1).get_json()['attempts_remaining'] == 2
+        
+        response = self._validate(client, correct_answer)
+        assert response.status_code == 200
+        assert response.get_json()['participation_confirmed'] is True
+        assert fake_redis.hashes == {}
+        
+        with app.app_context():
+            assert CaptchaSession.query.count() == 0
+            assert Participant.query.filter_by(giveaway_id=7, user_id=5).count() == 1
+    
+    def test_validate_loads_session_and_record_in_one_query(self, app, client):
+        """A wrong answer costs the joined lookup plus the attempt update"""
+        self._generate(client)
+        with app.app_context():
+            db.session.add(UserCaptchaRecord(user_id=5, captcha_completed=False, total_participations=0))
+            db.session.commit()
+            correct_answer = CaptchaSession.query.one().correct_answer
+        
+        app.config['MAX_QUERIES_PER_REQUEST'] = 2
+        response = self._validate(client, correct_answer + 1)
+        
+        assert response.status_code == 200
+        assert response.get_json()['attempts_remaining'] == 2
+    
+    def test_validate_reports_existing_participation(self, app, client):
+        """The ON CONFLICT insert turns a repeat join into 'already participated'"""
+        self._generate(client)
+        with app.app_context():
+            db.session.add(Participant(giveaway_id=7, user_id=5))
+            db.session.commit()
+            participant_id = Participant.query.one().id
+            correct_answer = CaptchaSession.query.one().correct_answer
+        
+        response = self._validate(client, correct_answer)
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['participant_id'] == participant_id
+        assert data['note'] == 'User already participated'
+        with app.app_context():
+            assert Participant.query.count() == 1
+    
+    def test_unsubscribed_user_keeps_session_open(self, app, client):
+        """Nothing is committed until the subscription check passes, then
+        the session, record and participant go out in one commit"""
+        self._generate(client)
+        with app.app_context():
+            correct_answer = CaptchaSession.query.one().correct_answer
+        
+        self.subscribed = False
+        response = self._validate(client, correct_answer)
+        assert response.status_code == 400
+        assert response.get_json()['error_code'] == 'USER_NOT_SUBSCRIBED'
+        with app.app_context():
+            captcha_session = CaptchaSession.query.one()
+            assert (captcha_session.completed, captcha_session.attempts) == (False, 0)
+            assert UserCaptchaRecord.query.count() == 0
+        
+        self.subscribed = True
+        commits = []
+        count_commit = commits.append
+        event.listen(Session, 'after_commit', count_commit)
+        try:
+            assert self._validate(client, correct_answer).get_json()['participation_confirmed'] is True
+        finally:
+            event.remove(Session, 'after_commit', count_commit)
+        assert len(commits) == 1
+        with app.app_context():
+            assert CaptchaSession.query.one().completed is True
+            assert UserCaptchaRecord.query.one().total_participations == 1
+    
+    def test_exhausted_attempts_replace_the_question(self, app, client):
+        """The last wrong answer is recorded and a fresh session replaces it"""
+        self._generate(client)
+        with app.app_context():
+            correct_answer = CaptchaSession.query.one().correct_answer
+        
+        for _ in range(2):
+            self._validate(client, correct_answer + 1)
+        response = self._validate(client, correct_answer + 1)
+        
+        data = response.get_json()
+        assert data['error'] == 'Maximum attempts exceeded. New question generated.'
+        assert data['attempts_remaining'] == 3
+        with app.app_context():
+            sessions = CaptchaSession.query.order_by(CaptchaSession.id).all()
+            assert [captcha_session.attempts for captcha_session in sessions] == [3, 0]
+            assert sessions[1].question == data['new_question']
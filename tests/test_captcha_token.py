@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from utils.captcha_token import issue_token, parse_token, answer_matches
+
+KEY = b'test-secret'
+
+class TestCaptchaToken:
+    
+    @pytest.fixture
+    def token(self):
+        """Parsed token for user 5 in giveaway 7 whose answer is 12"""
+        return parse_token(issue_token(KEY, 5, 7, 12, 600))
+    
+    def test_issue_then_parse(self, token):
+        """An issued token parses into a future expiry, a nonce and a signature"""
+        expires, nonce, signature = token
+        
+        assert 0 < expires - time.time() <= 600
+        assert nonce and len(signature) == 32
+    
+    def test_correct_answer_matches(self, token):
+        """The issued answer matches, in any form validate_answer accepts"""
+        for answer in (12, '12', ' 12 ', '012'):
+            assert answer_matches(KEY, token, 5, 7, answer)
+    
+    def test_wrong_or_malformed_answer_does_not_match(self, token):
+        """Other numbers and non-numeric answers are rejected"""
+        for answer in (13, '1 2', 'twelve', '', None):
+            assert not answer_matches(KEY, token, 5, 7, answer)
+    
+    def test_token_is_bound_to_user_giveaway_and_key(self, token):
+        """A token cannot be redeemed by another user, giveaway or key"""
+        assert not answer_matches(KEY, token, 6, 7, 12)
+        assert not answer_matches(KEY, token, 5, 8, 12)
+        assert not answer_matches(b'other-secret', token, 5, 7, 12)
+    
+    def test_tampered_token_does_not_match(self, token):
+        """Changing the expiry, nonce or signature invalidates the token"""
+        expires, nonce, signature = token
+        flipped = ('0' if signature[0] != '0' else '1') + signature[1:]
+        
+        assert not answer_matches(KEY, (expires + 3600, nonce, signature), 5, 7, 12)
+        assert not answer_matches(KEY, (expires, nonce + 'x', signature), 5, 7, 12)
+        assert not answer_matches(KEY, (expires, nonce, flipped), 5, 7, 12)
+    
+    @pytest.mark.parametrize('session_id', [None, 42, '', 'sess_12', 'a.b.c', '1.2', '1.2.3.4', '-1.n.s'])
+    def test_parse_rejects_malformed_tokens(self, session_id):
+        """Anything but '<expires>.<nonce>.<signature>' is not a token"""
+        assert parse_token(session_id) is None
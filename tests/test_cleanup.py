@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import create_app
+from models import db, CaptchaSession
+from config import TestingConfig
+from tasks import scheduler
+
+class TestCleanup:
+
+    @pytest.fixture
+    def app(self):
+        """Create test application with five expired sessions and one live one"""
+        app = create_app('testing')
+        app.config.from_object(TestingConfig)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        app.config['CLEANUP_BATCH_SIZE'] = 2
+        
+        now = datetime.now(timezone.utc)
+        with app.app_context():
+            db.create_all()
+            for user_id in range(5):
+                db.session.add(CaptchaSession(
+                    user_id=user_id, giveaway_id=1, question='q', correct_answer=1,
+                    expires_at=now - timedelta(minutes=1)
+                ))
+            db.session.add(CaptchaSession(
+                user_id=99, giveaway_id=1, question='q', correct_answer=1,
+                expires_at=now + timedelta(minutes=5)
+            ))
+            db.session.commit()
+        yield app
+        with app.app_context():
+            db.drop_all()
+    
+    def _remaining_users(self, app):
+        with app.app_context():
+            return [captcha_session.user_id for captcha_session in CaptchaSession.query]
+    
+    def test_admin_cleanup_deletes_expired_sessions_in_batches(self, app):
+        """/admin/cleanup runs the shared batched delete with the configured batch size"""
+        response = app.test_client().post('/admin/cleanup')
+        
+        assert response.status_code == 200
+        assert response.get_json()['results']['expired_captcha_sessions'] == 5
+        assert self._remaining_users(app) == [99]
+    
+    def test_captcha_cleanup_endpoint_uses_the_shared_delete(self, app):
+        """The manual captcha-sessions trigger runs the same batched delete"""
+        response = app.test_client().post('/api/participants/captcha-sessions/cleanup')
+        
+        assert response.get_json() == {'success': True, 'cleaned_sessions': 5}
+        assert self._remaining_users(app) == [99]
+    
+    def test_scheduled_job_uses_the_shared_delete(self, app):
+        """The background job deletes through the same path in its own app context"""
+        scheduler._cleanup_expired(app)
+        
+        assert self._remaining_users(app) == [99]
@@ -0,0 +1,59 @@
+import pytest
+
+from app import create_app
+from config import TestingConfig
+from services import health_probe
+
+class TestHealthRoutes:
+
+    @pytest.fixture
+    def app(self):
+        """Create test application"""
+        app = create_app('testing')
+        app.config.from_object(TestingConfig)
+        return app
+    
+    @pytest.fixture
+    def probes(self, monkeypatch):
+        """Replace the network probes with canned results, counting rounds"""
+        probes = {
+            'results': {
+                name: {'url': url, 'accessible': True}
+                for name, url in health_probe.EXTERNAL_SERVICES.items()
+            },
+            'rounds': 0
+        }
+        
+        def probe_all():
+            probes['rounds'] += 1
+            return {name: dict(result) for name, result in probes['results'].items()}
+        
+        monkeypatch.setattr(health_probe, '_probe_all', probe_all)
+        monkeypatch.setitem(health_probe._probe_cache, 'at', None)
+        return probes
+    
+    def test_external_outage_is_degraded_not_unhealthy(self, app, probes):
+        """An unreachable dependency reports degraded with a 200"""
+        probes['results']['auth_service']['accessible'] = False
+        
+        response = app.test_client().get('/health/external')
+        
+        assert response.status_code == 200
+        assert response.get_json()['status'] == 'degraded'
+    
+    def test_external_all_reachable_is_healthy(self, app, probes):
+        """Every dependency answering reports healthy"""
+        response = app.test_client().get('/health/external')
+        
+        assert response.status_code == 200
+        assert response.get_json()['status'] == 'healthy'
+    
+    def test_external_probes_are_shared_between_requests(self, app, probes):
+        """Back-to-back requests reuse one round of parallel probes"""
+        client = app.test_client()
+        
+        first = client.get('/health/external').get_json()
+        second = client.get('/health/external').get_json()
+        
+        assert probes['rounds'] == 1
+        assert first['external_services'] == second['external_services']
@@ -0,0 +1,66 @@
+import pytest
+from flask import Flask
+
+from utils.redis_cache import RedisCache
+
+class FakeSlidingWindow:
+    """In-memory stand-in for the sliding-window Lua script"""
+    
+    def __init__(self):
+        self.calls = {}
+    
+    def __call__(self, keys, args):
+        now, window, limit, member = args
+        calls = [at for at in self.calls.get(keys[0], []) if at > now - window]
+        if len(calls) >= limit:
+            self.calls[keys[0]] = calls
+            return 0
+        self.calls[keys[0]] = calls + [now]
+        return 1
+
+class TestRateLimiter:
+    
+    @pytest.fixture
+    def cache(self):
+        """RedisCache whose limiter script runs in memory"""
+        cache = RedisCache()
+        cache._client = object()
+        cache._sliding_window = FakeSlidingWindow()
+        return cache
+    
+    def test_allows_up_to_the_limit_then_denies(self, cache):
+        """The limit-th call in the window is admitted, the next one is not"""
+        assert [cache.allow('rl:captcha:1', 3, 60) for _ in range(4)] == [True, True, True, False]
+    
+    def test_limits_are_per_key(self, cache):
+        """One user hitting the limit does not throttle another"""
+        for _ in range(2):
+            cache.allow('rl:captcha:1', 2, 60)
+        
+        assert cache.allow('rl:captcha:1', 2, 60) is False
+        assert cache.allow('rl:captcha:2', 2, 60) is True
+    
+    def test_window_slides(self, cache, monkeypatch):
+        """Calls older than the window stop counting"""
+        clock = {'now': 1000.0}
+        monkeypatch.setattr('utils.redis_cache.time.time', lambda: clock['now'])
+        
+        assert cache.allow('rl:captcha:1', 1, 60) is True
+        assert cache.allow('rl:captcha:1', 1, 60) is False
+        clock['now'] += 61
+        assert cache.allow('rl:captcha:1', 1, 60) is True
+    
+    def test_fails_open_when_disabled(self):
+        """Without Redis every call is admitted"""
+        assert RedisCache().allow('rl:captcha:1', 0, 60) is True
+    
+    def test_fails_open_when_redis_is_down(self):
+        """An unreachable server admits the call and is then bypassed"""
+        app = Flask(__name__)
+        app.config.update(REDIS_CACHE_ENABLED=True, REDIS_URL='redis://127.0.0.1:1')
+        cache = RedisCache()
+        cache.init_app(app)
+        
+        assert cache.allow('rl:captcha:1', 0, 60) is True
+        assert not cache._available()
+        assert cache.allow('rl:captcha:1', 0, 60) is True
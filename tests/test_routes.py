@@ -0,0 +1,55 @@
+import importlib
+import pkgutil
+from collections import Counter
+
+from flask import Blueprint, Flask
+
+import routes
+
+def _blueprints():
+    """Every Blueprint defined in a routes module"""
+    for module_info in pkgutil.iter_modules(routes.__path__):
+        module = importlib.import_module(f'routes.{module_info.name}')
+        for value in vars(module).values():
+            if isinstance(value, Blueprint) and value.import_name == module.__name__:
+                yield value
+
+class TestRoutes:
+
+    def test_no_duplicate_rules_within_blueprint(self):
+        """A blueprint must not define the same URL rule and method twice"""
+        for blueprint in _blueprints():
+            app = Flask(__name__)
+            app.register_blueprint(blueprint)
+
+            rules = Counter(
+                (rule.rule, method)
+                for rule in app.url_map.iter_rules()
+                if rule.endpoint != 'static'
+                for method in rule.methods - {'HEAD', 'OPTIONS'}
+            )
+            duplicates = [key for key, count in rules.items() if count > 1]
+
+            assert duplicates == [], f'{blueprint.name}: {duplicates}'
+
+    def test_admin_blueprint_serves_each_admin_route(self):
+        """routes/admin_optimized.py serves every admin URL with its method"""
+        from routes.admin_optimized import admin_optimized_bp
+
+        app = Flask(__name__)
+        app.register_blueprint(admin_optimized_bp)
+        rules = {
+            (rule.rule, method)
+            for rule in app.url_map.iter_rules()
+            if rule.endpoint != 'static'
+            for method in rule.methods - {'HEAD', 'OPTIONS'}
+        }
+
+        assert rules == {
+            ('/admin/update-schema', 'POST'),
+            ('/admin/init-db', 'POST'),
+            ('/admin/db-status', 'GET'),
+            ('/admin/cleanup', 'POST'),
+            ('/admin/stats-fast', 'GET'),
+            ('/admin/stats', 'GET'),
+        }
@@ -1,14 +1,29 @@
-from .captcha_generator import captcha_generator
-from .winner_selection import winner_selector, select_winners_cryptographic, select_winners
-from .subscription_checker import subscription_checker
-from .validation import input_validator
-
-__all__ = [
-    'captcha_generator',
-    'winner_selector',
-    'select_winners_cryptographic',
-    'select_winners',
-    'subscription_checker',
-    'input_validator'
-]
+import importlib
 
+# Names are resolved lazily (PEP 562) so importing one utils submodule, e.g.
+# utils.json_provider from the app factory, does not load the others and
+# their dependencies (requests, services, ...).
+_EXPORTS = {
+    'captcha_generator': 'captcha_generator',
+    'winner_selector': 'winner_selection',
+    'select_winners_cryptographic': 'winner_selection',
+    'select_winners': 'winner_selection',
+    'subscription_checker': 'subscription_checker',
+    'input_validator': 'validation',
+    'OrjsonProvider': 'json_provider',
+    'redis_cache': 'redis_cache'
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,13 +1,18 @@
+import hmac
 import random
-import os
 from typing import Tuple
+from config.settings import (
+    CAPTCHA_MIN_NUMBER, CAPTCHA_MAX_NUMBER, CAPTCHA_MAX_ATTEMPTS, CAPTCHA_TIMEOUT_MINUTES
+)
 
 class CaptchaGenerator:
     """Generate simple math captcha questions for user verification"""
     
     def __init__(self):
-        self.min_number = int(os.getenv('CAPTCHA_MIN_NUMBER', 1))
-        self.max_number = int(os.getenv('CAPTCHA_MAX_NUMBER', 10))
+        self.min_number = CAPTCHA_MIN_NUMBER
+        self.max_number = CAPTCHA_MAX_NUMBER
+        self.max_attempts = CAPTCHA_MAX_ATTEMPTS
+        self.timeout_minutes = CAPTCHA_TIMEOUT_MINUTES
     
     def generate_addition_question(self) -> Tuple[str, int]:
         """Generate a simple addition question"""
@@ -56,12 +61,13 @@ class CaptchaGenerator:
         return question_type()
     
     def validate_answer(self, user_answer: str, correct_answer: int) -> bool:
-        """Validate user's answer against the correct answer"""
+        """Validate user's answer against the correct answer (constant time)"""
         try:
-            user_answer_int = int(user_answer.strip())
-            return user_answer_int == correct_answer
-        except (ValueError, AttributeError):
+            user_answer_int = int(str(user_answer).strip())
+        except ValueError:
             return False
+        # Compare canonical decimal forms, so "07" still matches 7
+        return hmac.compare_digest(str(user_answer_int).encode(), str(correct_answer).encode())
     
     def generate_captcha_data(self) -> dict:
         """Generate complete captcha data for API responses"""
@@ -70,8 +76,8 @@ class CaptchaGenerator:
         return {
             'question': question,
             'correct_answer': answer,
-            'max_attempts': int(os.getenv('CAPTCHA_MAX_ATTEMPTS', 3)),
-            'timeout_minutes': int(os.getenv('CAPTCHA_TIMEOUT_MINUTES', 10))
+            'max_attempts': self.max_attempts,
+            'timeout_minutes': self.timeout_minutes
         }
 
 # Global instance
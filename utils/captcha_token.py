@@ -0,0 +1,44 @@
+import hashlib
+import hmac
+import secrets
+import time
+from typing import Optional, Tuple
+
+# Stateless captcha sessions: the token carries its expiry and a nonce and is
+# signed together with the user, giveaway and correct answer, so an answer is
+# checked by recomputing the signature instead of reading a stored row.
+
+def _canonical_answer(answer) -> Optional[str]:
+    """Decimal form of an integer answer (as captcha_generator.validate_answer
+    reads it, so "07" and " 7" sign like 7), else None"""
+    try:
+        return str(int(str(answer).strip()))
+    except ValueError:
+        return None
+
+def _signature(key: bytes, user_id, giveaway_id, expires: int, nonce: str, answer: str) -> str:
+    message = f'{user_id}.{giveaway_id}.{expires}.{nonce}.{answer}'.encode()
+    return hmac.new(key, message, hashlib.sha256).hexdigest()[:32]
+
+def issue_token(key: bytes, user_id, giveaway_id, answer: int, ttl_seconds: int) -> str:
+    """Signed '<expires>.<nonce>.<signature>' token for one captcha question"""
+    expires = int(time.time()) + ttl_seconds
+    nonce = secrets.token_urlsafe(8)
+    signature = _signature(key, user_id, giveaway_id, expires, nonce, _canonical_answer(answer))
+    return f'{expires}.{nonce}.{signature}'
+
+def parse_token(token) -> Optional[Tuple[int, str, str]]:
+    """(expires, nonce, signature) of a well-formed token, else None"""
+    parts = token.split('.') if isinstance(token, str) else ()
+    if len(parts) != 3 or not parts[0].isdigit():
+        return None
+    return int(parts[0]), parts[1], parts[2]
+
+def answer_matches(key: bytes, token: Tuple[int, str, str], user_id, giveaway_id, answer) -> bool:
+    """Whether answer is the one the token was issued for (constant time)"""
+    answer = _canonical_answer(answer)
+    if answer is None:
+        return False
+    expires, nonce, signature = token
+    expected = _signature(key, user_id, giveaway_id, expires, nonce, answer)
+    return hmac.compare_digest(expected, signature)
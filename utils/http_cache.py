@@ -0,0 +1,23 @@
+import hashlib
+from flask import current_app, request
+
+# Flask-Compress appends the coding to ETags it compresses ("abc" -> "abc:gzip")
+_ETAG_SUFFIXES = ('', ':gzip', ':br', ':deflate')
+
+def encode_json(payload):
+    """Serialize a payload once; the ETag is a hash of exactly those bytes"""
+    body = current_app.json.dumps(payload).encode()
+    return body, hashlib.blake2b(body, digest_size=16).hexdigest()
+
+def conditional_response(body, etag, status=200, headers=None):
+    """JSON response with a weak ETag; answers a matching If-None-Match with 304.
+
+    The validator a client sends back may carry the suffix Flask-Compress
+    added, so every compressed variant of the tag matches as well.
+    """
+    if status == 200 and any(request.if_none_match.contains_weak(etag + suffix) for suffix in _ETAG_SUFFIXES):
+        response = current_app.response_class(status=304, headers=headers)
+    else:
+        response = current_app.response_class(body, status=status, mimetype='application/json', headers=headers)
+    response.set_etag(etag, weak=True)
+    return response
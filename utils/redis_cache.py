@@ -0,0 +1,187 @@
+import logging
+import secrets
+import time
+import orjson
+import redis
+
+logger = logging.getLogger(__name__)
+
+# After a Redis error the cache is bypassed for this many seconds, so a dead
+# server costs one failed call per interval instead of a timeout per request
+RETRY_AFTER = 30
+SOCKET_TIMEOUT = 0.25
+
+# Bump a cached count only while it exists (INCR keeps its TTL); a missing
+# key stays missing so the next read recomputes it from the database
+_INCR_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCR', KEYS[1])
+end
+return false
+"""
+
+# INCR that sets the TTL when it creates the key
+_INCR_WITH_TTL = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
+# Sliding-window limiter: drop entries older than the window, then admit
+# and record the call only while fewer than the limit remain
+_SLIDING_WINDOW = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, ARGV[1] - ARGV[2])
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+# Count an attempt against a hash and read it back, only while it exists
+_INCR_HASH = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+redis.call('HINCRBY', KEYS[1], ARGV[1], 1)
+return redis.call('HMGET', KEYS[1], unpack(ARGV, 2))
+"""
+
+class RedisCache:
+    """Best-effort JSON cache in front of the database.
+
+    Reads degrade to a miss and writes to a no-op when the cache is disabled
+    or Redis is unreachable, so callers always fall back to the database.
+    """
+
+    def __init__(self):
+        self._client = None
+        self._incr_if_exists = None
+        self._incr_with_ttl = None
+        self._sliding_window = None
+        self._incr_hash = None
+        self._down_until = 0.0
+
+    def init_app(self, app):
+        """Use REDIS_URL when REDIS_CACHE_ENABLED is set; connects on first use"""
+        self._client = None
+        if app.config.get('REDIS_CACHE_ENABLED'):
+            self._client = redis.Redis.from_url(
+                app.config['REDIS_URL'],
+                socket_connect_timeout=SOCKET_TIMEOUT,
+                socket_timeout=SOCKET_TIMEOUT
+            )
+            self._incr_if_exists = self._client.register_script(_INCR_IF_EXISTS)
+            self._incr_with_ttl = self._client.register_script(_INCR_WITH_TTL)
+            self._sliding_window = self._client.register_script(_SLIDING_WINDOW)
+            self._incr_hash = self._client.register_script(_INCR_HASH)
+
+    @property
+    def enabled(self):
+        """Whether Redis is configured (it may still be unreachable)"""
+        return self._client is not None
+
+    def _available(self):
+        return self._client is not None and time.monotonic() >= self._down_until
+
+    def _failed(self, error):
+        self._down_until = time.monotonic() + RETRY_AFTER
+        logger.warning("Redis unavailable, bypassing cache for %ss: %s", RETRY_AFTER, error)
+
+    def get_json(self, key):
+        """Cached value for key, or None on a miss"""
+        if not self._available():
+            return None
+        try:
+            value = self._client.get(key)
+        except redis.RedisError as e:
+            self._failed(e)
+            return None
+        return orjson.loads(value) if value is not None else None
+
+    def set_json(self, key, value, ttl):
+        """Cache value under key for ttl seconds"""
+        if not self._available():
+            return
+        try:
+            self._client.set(key, orjson.dumps(value, option=orjson.OPT_NAIVE_UTC), ex=ttl)
+        except redis.RedisError as e:
+            self._failed(e)
+
+    def delete(self, *keys):
+        """Drop cached keys"""
+        if not keys or not self._available():
+            return
+        try:
+            self._client.delete(*keys)
+        except redis.RedisError as e:
+            self._failed(e)
+
+    def incr_if_exists(self, key):
+        """Increment a cached integer in place; no-op when it is not cached"""
+        if not self._available():
+            return
+        try:
+            self._incr_if_exists(keys=[key])
+        except redis.RedisError as e:
+            self._failed(e)
+
+    def incr(self, key, ttl):
+        """Increment key, expiring it ttl seconds after creation.
+
+        Returns the new value, or None when Redis is unavailable.
+        """
+        if not self._available():
+            return None
+        try:
+            return self._incr_with_ttl(keys=[key], args=[ttl])
+        except redis.RedisError as e:
+            self._failed(e)
+            return None
+
+    def set_hash(self, key, mapping, ttl):
+        """Store mapping as a hash expiring in ttl seconds; False if Redis is unavailable"""
+        if not self._available():
+            return False
+        try:
+            pipe = self._client.pipeline()
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, ttl)
+            pipe.execute()
+            return True
+        except redis.RedisError as e:
+            self._failed(e)
+            return False
+
+    def incr_hash(self, key, field, fields):
+        """Increment one field of an existing hash and return the values of fields.
+
+        Returns None when the hash does not exist or Redis is unavailable.
+        """
+        if not self._available():
+            return None
+        try:
+            return self._incr_hash(keys=[key], args=[field, *fields])
+        except redis.RedisError as e:
+            self._failed(e)
+            return None
+
+    def allow(self, key, limit, window):
+        """Record a call under key; False once limit calls fell within the last window seconds.
+
+        Fails open (always True) when Redis is disabled or unreachable.
+        """
+        if not self._available():
+            return True
+        now = time.time()
+        try:
+            return bool(self._sliding_window(keys=[key], args=[now, window, limit, f'{now}:{secrets.token_hex(4)}']))
+        except redis.RedisError as e:
+            self._failed(e)
+            return True
+
+# Global instance
+redis_cache = RedisCache()
@@ -2,7 +2,7 @@ import secrets
 import os
 import hashlib
 from typing import List, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 
 class WinnerSelector:
     """Cryptographically secure winner selection system"""
@@ -80,7 +80,7 @@ class WinnerSelector:
     
     def generate_selection_seed(self, giveaway_id: int) -> str:
         """Generate a unique seed for deterministic selection"""
-        timestamp = datetime.utcnow().isoformat()
+        timestamp = datetime.now(timezone.utc).isoformat()
         random_bytes = secrets.token_bytes(16)
         
         # Create seed from giveaway ID, timestamp, and random data
@@ -119,7 +119,7 @@ class WinnerSelector:
             'winner_count_selected': len(winners),
             'selection_method': method,
             'selection_seed': seed,
-            'selection_timestamp': datetime.utcnow().isoformat()
+            'selection_timestamp': datetime.now(timezone.utc).isoformat()
         }
         
         return result